@@ -1,13 +1,155 @@
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any
 import argparse
+import asyncio
+import itertools
+import logging
+import queue
+import threading
 from src.cli.cli_interface import CLIInterface
 from src.cli.path_handler import PathHandler
-from src.core.parser.angular_parser import AngularParser
-from src.core.extractor.component_extractor import ComponentExtractor
+from src.core.extractor.component_extractor import UIPattern
+from src.core.extractor.extraction_worker import init_worker, process_components
 from src.core.analyzer.pattern_analyzer import PatternAnalyzer
+from src.core.cache.pattern_cache import PatternCache
 from src.output.report_generator import ReportGenerator
 from src.output.catalog_generator import CatalogGenerator
 
+logger = logging.getLogger(__name__)
+
+
+def _submit_batch(
+    batch: List[Path],
+    components: Dict[Path, Dict[str, Any]],
+    path_handler: PathHandler,
+    cache: PatternCache,
+    known_patterns: Dict[str, Any],
+    executor: ProcessPoolExecutor,
+) -> Dict[str, Any]:
+    """Reads a batch's sources and submits its cache misses to the worker pool without waiting on them"""
+    # Each slot holds either a pattern list or a (future, offset) pair into a submitted chunk
+    slots = [[] for _ in batch]
+    new_entries = []
+    pending_sources = []
+    pending_slots = []
+    cache_hits = 0
+    duplicates = 0
+
+    # Only components with a template produce patterns, so only those are read
+    template_indices = [index for index, file in enumerate(batch) if components[file]['template']]
+    batch_sources = asyncio.run(
+        path_handler.read_components_async([components[batch[index]] for index in template_indices])
+    )
+
+    pending_digests = set()
+    duplicate_slots = []
+    for index, sources in zip(template_indices, batch_sources):
+        component_file = str(batch[index])
+        sha = PatternCache.compute_digest(sources)
+        if sha in known_patterns or sha in pending_digests:
+            # Identical sources were already seen this run (possibly still being parsed)
+            duplicate_slots.append((index, sha))
+            new_entries.append((index, component_file, sha))
+            duplicates += 1
+            continue
+
+        cached_patterns = cache.get(component_file, sha) if cache else None
+        if cached_patterns is not None:
+            slots[index] = known_patterns[sha] = cached_patterns
+            cache_hits += 1
+        else:
+            pending_sources.append(sources)
+            pending_slots.append((index, sha))
+            pending_digests.add(sha)
+            new_entries.append((index, component_file, sha))
+
+    chunk_size = 16
+    for start in range(0, len(pending_sources), chunk_size):
+        future = executor.submit(process_components, pending_sources[start : start + chunk_size])
+        for offset, (index, sha) in enumerate(pending_slots[start : start + chunk_size]):
+            slots[index] = known_patterns[sha] = (future, offset)
+
+    for index, sha in duplicate_slots:
+        slots[index] = known_patterns[sha]
+
+    return {'slots': slots, 'new_entries': new_entries, 'cache_hits': cache_hits, 'duplicates': duplicates}
+
+
+def _collect_batch(submitted: Dict[str, Any], cache: PatternCache) -> List[UIPattern]:
+    """Waits for a submitted batch and stores its newly parsed components in the cache"""
+    batch_results = []
+    for slot in submitted['slots']:
+        if isinstance(slot, tuple):
+            future, offset = slot
+            slot = future.result()[offset]
+        batch_results.append(slot)
+
+    if cache:
+        cache.put_many([(path, sha, batch_results[index]) for index, path, sha in submitted['new_entries']])
+
+    return list(itertools.chain.from_iterable(batch_results))
+
+
+def _produce_batches(
+    components: Dict[Path, Dict[str, Any]],
+    path_handler: PathHandler,
+    cache: PatternCache,
+    batch_queue: queue.Queue,
+    stop_event: threading.Event,
+):
+    """Parses components batch by batch and feeds each batch's patterns into the queue until stopped"""
+    try:
+        component_files = list(components.keys())
+        # Patterns of every source digest seen this run, so identical components are parsed once
+        known_patterns = {}
+
+        # Read the next batch while the worker processes parse the previous one
+        batch_size = 50
+        with ProcessPoolExecutor(initializer=init_worker) as executor:
+            previous = None
+            for i in range(0, len(component_files), batch_size):
+                if stop_event.is_set():
+                    return
+                batch = component_files[i : i + batch_size]
+                submitted = _submit_batch(batch, components, path_handler, cache, known_patterns, executor)
+                if previous:
+                    _queue_batch(previous, cache, batch_queue, stop_event)
+                previous = submitted
+
+            if previous:
+                _queue_batch(previous, cache, batch_queue, stop_event)
+
+    except Exception as e:
+        _put_unless_stopped(batch_queue, e, stop_event)
+        return
+
+    _put_unless_stopped(batch_queue, None, stop_event)
+
+
+def _put_unless_stopped(batch_queue: queue.Queue, item: Any, stop_event: threading.Event):
+    """Puts an item on the bounded queue, giving up once the consumer has stopped reading"""
+    while not stop_event.is_set():
+        try:
+            batch_queue.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _queue_batch(submitted: Dict[str, Any], cache: PatternCache, batch_queue: queue.Queue, stop_event: threading.Event):
+    """Collects a submitted batch and hands its patterns to the analyzer queue"""
+    # Once the consumer has stopped, remaining batches are dropped instead of collected and cached
+    if stop_event.is_set():
+        return
+    batch_patterns = _collect_batch(submitted, cache)
+    _put_unless_stopped(batch_queue, batch_patterns, stop_event)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"Processed batch of {len(submitted['slots'])} components, found {len(batch_patterns)} patterns "
+            f"({submitted['cache_hits']} from cache, {submitted['duplicates']} duplicates)"
+        )
+
 
 def main():
     # Initialize argument parser
@@ -15,58 +157,64 @@ def main():
     parser.add_argument('--project-path', required=True, help='Path to Angular project')
     parser.add_argument('--output-format', choices=['cli', 'json', 'both', 'all'], default='both', help='Output format')
     parser.add_argument('--export-path', help='Path for JSON export', default='./pattern-report.json')
+    parser.add_argument('--pretty-json', action='store_true', help='Indent the exported JSON report')
     parser.add_argument('--generate-catalog', action='store_true', help='Generate HTML pattern catalog')
+    parser.add_argument(
+        '--cache-path',
+        help='Path for the pattern cache; entries are unpickled, so only use a file you created',
+        default='./.pattern-cache.sqlite',
+    )
+    parser.add_argument('--no-cache', action='store_true', help='Disable the persistent pattern cache')
+    parser.add_argument('--verbose', action='store_true', help='Print debug output while analyzing')
 
     args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format='%(message)s')
 
     # Initialize components
     cli = CLIInterface()
     path_handler = PathHandler()
-    parser = AngularParser()
-    extractor = ComponentExtractor()
     analyzer = PatternAnalyzer()
+    cache = None if args.no_cache else PatternCache(db_path=Path(args.cache_path))
+    producer = None
+    stop_event = threading.Event()
 
     try:
         cli.display_progress("Analyzing Angular project...")
 
         # Find and parse components
         path_handler.validate_project_path(Path(args.project_path))  # Validate first
-        path_handler._debug_path_search(Path(args.project_path))  # Debug output
-        component_files = path_handler.find_component_files(Path(args.project_path))
+        components = path_handler.scan_project(Path(args.project_path))
 
-        if not component_files:
+        if not components:
             cli.display_error("No Angular components found in the project")
             return 1
 
-        cli.display_progress(f"Found {len(component_files)} components")
+        cli.display_progress(f"Found {len(components)} components")
 
-        # Initialize patterns list
-        patterns = []
+        # Stream batches from the producer thread into the analyzer as they complete
+        batch_queue = queue.Queue(maxsize=4)
+        producer = threading.Thread(
+            target=_produce_batches, args=(components, path_handler, cache, batch_queue, stop_event), daemon=True
+        )
+        producer.start()
 
-        # Process components in batches
-        batch_size = 50
-        for i in range(0, len(component_files), batch_size):
-            batch = component_files[i : i + batch_size]
-            batch_patterns = []
+        while True:
+            batch_patterns = batch_queue.get()
+            if batch_patterns is None:
+                break
+            if isinstance(batch_patterns, Exception):
+                raise batch_patterns
+            analyzer.update(batch_patterns)
 
-            for component_file in batch:
-                related_files = path_handler.get_related_files(component_file)
-                component_data = parser.parse_component(related_files)
-                if related_files['template']:
-                    component_patterns = extractor.extract_patterns(component_data)
-                    batch_patterns.extend(component_patterns)
-
-            patterns.extend(batch_patterns)
-            print(f"Processed batch {i//batch_size + 1}, found {len(batch_patterns)} patterns")
+        producer.join()
 
         cli.display_progress("Analyzing patterns...")
-        analysis_results = analyzer.analyze_patterns(patterns)
+        analysis_results = analyzer.finalize()
 
-        # Debug print
-        print("\nAnalysis results:")
-        print(f"Total patterns: {len(patterns)}")
-        print(f"Unique pattern types: {len(analysis_results['patterns'])}")
-        print(f"Pattern types found: {list(analysis_results['patterns'].keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Total patterns: {analysis_results['summary']['total_patterns_detected']}")
+            logger.debug(f"Unique pattern types: {len(analysis_results['patterns'])}")
+            logger.debug(f"Pattern types found: {list(analysis_results['patterns'].keys())}")
 
         # Generate catalog
         if args.generate_catalog:
@@ -75,17 +223,17 @@ def main():
             catalog_generator = CatalogGenerator(output_dir=output_dir)
             catalog_generator.generate_catalog(analysis_results=analysis_results)
 
-        # Verify the output
-        output_dir = Path("output/pattern-catalog")
-        if output_dir.exists():
-            print("\nGenerated files:")
-            for file in output_dir.rglob('*'):
-                if file.is_file():
-                    print(f"- {file.relative_to(output_dir)}")
+            # Verify the output
+            if logger.isEnabledFor(logging.DEBUG):
+                for file in output_dir.rglob('*'):
+                    if file.is_file():
+                        logger.debug(f"Generated file: {file.relative_to(output_dir)}")
 
         # Generate reports
         cli.display_progress("Generating reports...")
-        report_generator = ReportGenerator(output_format=args.output_format, export_path=Path(args.export_path))
+        report_generator = ReportGenerator(
+            output_format=args.output_format, export_path=Path(args.export_path), pretty_json=args.pretty_json
+        )
         report_generator.generate_report(analysis_results)
 
         cli.display_progress("Analysis complete!", complete=True)
@@ -95,6 +243,21 @@ def main():
         cli.display_error(str(e))
         return 1
 
+    finally:
+        if producer is not None:
+            # Stop the producer and empty the queue so it is not blocked on a put, then wait for it
+            # to finish before the cache it writes to is closed
+            stop_event.set()
+            try:
+                while True:
+                    batch_queue.get_nowait()
+            except queue.Empty:
+                pass
+            producer.join()
+
+        if cache:
+            cache.close()
+
 
 if __name__ == "__main__":
     exit(main())
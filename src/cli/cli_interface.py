@@ -1,7 +1,9 @@
 from typing import List
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import argparse
 from .path_handler import PathHandler
+from ..core.extractor.extraction_worker import init_worker, extract_component
 from rich.progress import Progress, SpinnerColumn, TimeElapsedColumn
 
 
@@ -71,12 +73,12 @@ class CLIInterface:
             total_files = len(component_files)
             task = progress.add_task("[cyan]Analyzing patterns...", total=total_files)
 
+            # Components are independent, so they are parsed and extracted across processes in input order
+            related_files_list = [self.path_handler.get_related_files(file) for file in component_files]
             patterns = []
-            for component_file in component_files:
-                related_files = self.path_handler.get_related_files(component_file)
-                component_data = self.parser.parse_component(related_files)
-                component_patterns = self.extractor.extract_patterns(component_data)
-                patterns.extend(component_patterns)
-                progress.update(task, advance=1)
+            with ProcessPoolExecutor(initializer=init_worker) as executor:
+                for component_patterns in executor.map(extract_component, related_files_list, chunksize=16):
+                    patterns.extend(component_patterns)
+                    progress.update(task, advance=1)
 
             return patterns
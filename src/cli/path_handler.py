@@ -1,11 +1,29 @@
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterator, Any, Tuple
+from functools import lru_cache
+import aiofiles
+import aiofiles.os
 import asyncio
+import itertools
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Number of bytes read from the head of a .component.ts file when looking for the decorator
+COMPONENT_HEAD_BYTES = 8192
+# Directories that never contain project components and are skipped while walking
+IGNORED_DIRECTORIES = frozenset(['node_modules', 'dist', '.angular', '.nx', 'coverage', '.git'])
+# Upper bound on files read concurrently by the async read phase
+MAX_CONCURRENT_READS = 64
 
 
 class PathHandler:
     def __init__(self):
         self.angular_extensions = ['.ts', '.html', '.scss', '.css']
+        self._scanned_projects = {}  # Scan results per base path, so the tree is walked once
+        self._head_buffer = bytearray(COMPONENT_HEAD_BYTES)  # Reused by every validation read
 
     def validate_project_path(self, path: Path) -> bool:
         """Validates if the given path contains Angular components."""
@@ -13,44 +31,111 @@ class PathHandler:
             return False
 
         # For sample projects, just check if we have component files
-        component_files = list(path.rglob("*.component.ts"))
-        return len(component_files) > 0
+        return len(self.scan_project(path)) > 0
 
     def find_component_files(self, base_path: Path) -> List[Path]:
         """Finds all Angular component files"""
-        # First, get all TypeScript files
-        all_ts_files = list(base_path.rglob("*.component.ts"))
-        if not all_ts_files:
+        return list(self.scan_project(base_path).keys())
+
+    def scan_project(self, base_path: Path) -> Dict[Path, Dict[str, Any]]:
+        """Finds all Angular components and their related files in a single walk"""
+        if base_path in self._scanned_projects:
+            return self._scanned_projects[base_path]
+
+        components = {}
+        candidate_count = 0
+        directories = itertools.chain.from_iterable(
+            self._walk_directories(root) for root in self._find_source_roots(base_path)
+        )
+        for directory, file_names in directories:
+            sibling_names = frozenset(file_names)
+            for name in file_names:
+                if not name.endswith('.component.ts'):
+                    continue
+
+                candidate_count += 1
+                file_path = Path(directory, name)
+                if self._is_valid_component(file_path):
+                    components[file_path] = self._collect_related_files(file_path, sibling_names)
+
+        if not candidate_count:
             print(f"No .component.ts files found in {base_path}")
-            return []
-
-        print(f"Found {len(all_ts_files)} potential component files")
-
-        component_files = []
-        for file_path in all_ts_files:
-            if self._is_valid_component(file_path):
-                component_files.append(file_path)
-                print(f"Valid component found: {file_path}")
-
-        if not component_files:
-            print("No valid Angular components found after validation")
         else:
-            print(f"Found {len(component_files)} valid Angular components")
-
-        return component_files
+            print(f"Found {candidate_count} potential component files")
+
+            if not components:
+                print("No valid Angular components found after validation")
+            else:
+                print(f"Found {len(components)} valid Angular components")
+
+        self._scanned_projects[base_path] = components
+        return components
+
+    def _find_source_roots(self, base_path: Path) -> List[Path]:
+        """Returns the sourceRoot of every project in angular.json, or the base path when there is none"""
+        # Every root is normalized the same way and stays relative when base_path is, so a component
+        # gets the same path (and cache key) whether or not the project has an angular.json
+        base_path = Path(os.path.normpath(base_path))
+        angular_json = base_path / 'angular.json'
+        try:
+            projects = json.loads(angular_json.read_text())['projects']
+            roots = [
+                base_path / (project.get('sourceRoot') or project.get('root') or '') for project in projects.values()
+            ]
+        except FileNotFoundError:
+            return [base_path]
+        except Exception as e:
+            logger.warning(f"Error reading {angular_json}, scanning the whole project: {str(e)}")
+            return [base_path]
+
+        # Drop missing roots and roots nested inside another root so nothing is walked twice
+        roots = {Path(os.path.normpath(root)) for root in roots if root.is_dir()}
+        roots = sorted(roots, key=lambda root: (len(root.parts), str(root)))
+        source_roots = []
+        for root in roots:
+            if not any(root.is_relative_to(other) for other in source_roots):
+                source_roots.append(root)
+        return source_roots or [base_path]
+
+    def _walk_directories(self, base_path: Path) -> Iterator[Tuple[str, List[str]]]:
+        """Yields (directory, file names) pairs using a single scandir walk"""
+        pending = [str(base_path)]
+        while pending:
+            current = pending.pop()
+            file_names = []
+            subdirectories = []
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        # DirEntry type checks use the cached d_type, so only symlinks cost an extra stat;
+                        # symlinked files are followed like rglob does, symlinked directories are not walked
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in IGNORED_DIRECTORIES:
+                                subdirectories.append(entry.path)
+                        elif entry.is_file():
+                            file_names.append(entry.name)
+            except OSError as e:
+                print(f"Error scanning directory {current}: {str(e)}")
+                continue
+
+            # Reversed onto the stack so directories are visited in the same pre-order as rglob
+            pending.extend(reversed(subdirectories))
+            yield current, file_names
 
     def _is_valid_component(self, file_path: Path) -> bool:
         """Validates if a file is an Angular component file"""
         try:
-            # Read the file content directly for small files
-            content = file_path.read_text()
-
-            # Debug output
-            print(f"Validating component: {file_path}")
-            has_component = '@Component' in content
-            print(f"Has @Component decorator: {has_component}")
-
-            return has_component
+            # The @Component decorator usually sits near the top of the file, so the head is read first
+            with open(file_path, 'rb', buffering=0) as f:
+                length = f.readinto(self._head_buffer)
+                if self._head_buffer.find(b'@Component', 0, length) != -1:
+                    return True
+                if length < COMPONENT_HEAD_BYTES:
+                    return False
+
+                # Long headers push the decorator past the head; step back so a split marker still matches
+                f.seek(length - len(b'@Component') + 1)
+                return f.read().find(b'@Component') != -1
 
         except Exception as e:
             print(f"Error validating component {file_path}: {str(e)}")
@@ -58,47 +143,84 @@ class PathHandler:
 
     def get_related_files(self, component_file: Path) -> Dict[str, Path]:
         """Gets related template, style, and spec files for a component."""
+        return self._collect_related_files(component_file, self._scan_dir(str(component_file.parent)))
+
+    def _collect_related_files(self, component_file: Path, sibling_names: frozenset) -> Dict[str, Path]:
+        """Matches a component's related files against the names in its directory"""
         base_name = component_file.stem.replace('.component', '')
         parent_dir = component_file.parent
 
         related_files = {'typescript': component_file, 'template': None, 'styles': [], 'spec': None}
 
         # Find template file
-        template = parent_dir / f"{base_name}.component.html"
-        if template.exists():
-            related_files['template'] = template
+        template_name = f"{base_name}.component.html"
+        if template_name in sibling_names:
+            related_files['template'] = parent_dir / template_name
 
         # Find style files
         for ext in ['.scss', '.css']:
-            style = parent_dir / f"{base_name}.component{ext}"
-            if style.exists():
-                related_files['styles'].append(style)
+            style_name = f"{base_name}.component{ext}"
+            if style_name in sibling_names:
+                related_files['styles'].append(parent_dir / style_name)
 
         # Find spec file
-        spec = parent_dir / f"{base_name}.component.spec.ts"
-        if spec.exists():
-            related_files['spec'] = spec
+        spec_name = f"{base_name}.component.spec.ts"
+        if spec_name in sibling_names:
+            related_files['spec'] = parent_dir / spec_name
 
         return related_files
 
-    def _debug_path_search(self, base_path: Path):
-        """Debug method to print file search results"""
-        print(f"\nDebug: Searching in {base_path}")
-        print("Found files:")
-        for ext in ['*.component.ts', '*.component.html', '*.component.scss', '*.component.css']:
-            files = list(base_path.rglob(ext))
-            print(f"{ext}: {len(files)} files")
-            for f in files[:5]:  # Show first 5 files of each type
-                print(f"  - {f}")
+    def read_component_sources(self, related_files: Dict[str, Path]) -> Dict[str, Any]:
+        """Reads the raw bytes of a component's TypeScript, template and style files."""
+        return {
+            'typescript': related_files['typescript'].read_bytes() if related_files['typescript'] else None,
+            'template': related_files['template'].read_bytes() if related_files['template'] else None,
+            'styles': [style.read_bytes() for style in related_files['styles']],
+        }
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _scan_dir(directory: str) -> frozenset:
+        """Cached listing of a directory so sibling components share one lookup"""
+        try:
+            return frozenset(os.listdir(directory))
+        except OSError:
+            return frozenset()
 
     async def get_related_files_async(self, component_file: Path) -> Dict[str, Path]:
         """Asynchronous file operations"""
-        related_files = {'typescript': None, 'template': None, 'styles': [], 'spec': None}
-
-        tasks = []
-        for ext in ['.ts', '.html', '.scss', '.css']:
-            tasks.append(self._check_file_exists_async(component_file, ext))
+        base_name = component_file.stem.replace('.component', '')
+        candidate_names = [f"{base_name}.component{ext}" for ext in ['.html', '.scss', '.css', '.spec.ts']]
 
+        tasks = [aiofiles.os.path.exists(component_file.parent / name) for name in candidate_names]
         results = await asyncio.gather(*tasks)
-        # Process results...
-        return related_files
+
+        sibling_names = frozenset(name for name, exists in zip(candidate_names, results) if exists)
+        return self._collect_related_files(component_file, sibling_names)
+
+    async def read_components_async(self, related_files_list: List[Dict[str, Path]]) -> List[Dict[str, Any]]:
+        """Reads the sources of many components concurrently, preserving input order"""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_READS)
+        return await asyncio.gather(
+            *[self.read_component_sources_async(related_files, semaphore) for related_files in related_files_list]
+        )
+
+    async def read_component_sources_async(
+        self, related_files: Dict[str, Path], semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """Asynchronous version of read_component_sources"""
+        typescript, template, *styles = await asyncio.gather(
+            self._read_bytes_async(related_files['typescript'], semaphore),
+            self._read_bytes_async(related_files['template'], semaphore),
+            *[self._read_bytes_async(style, semaphore) for style in related_files['styles']],
+        )
+        return {'typescript': typescript, 'template': template, 'styles': styles}
+
+    async def _read_bytes_async(self, file_path: Path, semaphore: asyncio.Semaphore) -> bytes:
+        """Reads a file's raw bytes, bounded by the shared semaphore"""
+        if file_path is None:
+            return None
+
+        async with semaphore:
+            async with aiofiles.open(file_path, 'rb') as f:
+                return await f.read()
@@ -1,46 +1,252 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, NamedTuple, Tuple
 from collections import defaultdict
-from ..extractor.component_extractor import UIPattern
+from ..extractor.component_extractor import UIPattern, count_directives
+import heapq
+import itertools
+import logging
 import re
 from ..profiler import PatternProfiler
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
 import multiprocessing
+import sys
 from functools import lru_cache
 
+try:
+    # Optional Aho-Corasick automaton for the HTML keyword probes; plain substring checks otherwise
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+# Below this many patterns, finalize() analyzes groups in-process instead of in worker processes
+PARALLEL_ANALYSIS_MIN_PATTERNS = 5000
+
+# Compiled once at import for the per-pattern complexity and similarity helpers
+BINDING_PATTERN = re.compile(r'\{\{[^}]+\}\}')
+EVENT_BINDING_PATTERN = re.compile(r'\([^)]+\)=')
+BINDING_EXPRESSION_PATTERN = re.compile(r'\{\{[^}]+\}\}|\[(.*?)\]|\((.*?)\)')
+ELEMENT_PATTERN = re.compile(r'<(\w+)[^>]*>')
+DIRECTIVE_NAME_PATTERN = re.compile(r'\*ng\w+')
+
+SEMANTIC_ELEMENT_TAGS = ('<header', '<nav', '<main', '<article', '<section', '<aside', '<footer')
+# Every literal the accessibility, usage-context and best-practices scorers probe html_structure for
+HTML_KEYWORDS = SEMANTIC_ELEMENT_TAGS + (
+    'aria-',
+    'aria-label',
+    'aria-labelledby',
+    'role=',
+    '<form',
+    '<label',
+    '<img',
+    'alt=',
+    '<button',
+    '>',
+    '[',
+    ']',
+    '(click)',
+    '*ngIf',
+    '*ngFor',
+    'class=',
+    'routerLink',
+)
+# Probed against the lowercased HTML instead
+LOWERCASE_HTML_KEYWORDS = ('modal', 'dialog', 'card')
+# One-character keywords occur at nearly every tag, so they are probed with `in` rather than reported by
+# the automaton once per occurrence
+SINGLE_CHARACTER_HTML_KEYWORDS = tuple(keyword for keyword in HTML_KEYWORDS if len(keyword) == 1)
+MULTI_CHARACTER_HTML_KEYWORDS = tuple(keyword for keyword in HTML_KEYWORDS if len(keyword) > 1)
+
+
+def _build_keyword_automaton(keywords: Tuple[str, ...]):
+    """Builds one automaton that reports every keyword, including overlapping ones, in a single scan"""
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+if ahocorasick is not None:
+    HTML_KEYWORD_AUTOMATON = _build_keyword_automaton(MULTI_CHARACTER_HTML_KEYWORDS)
+    LOWERCASE_HTML_KEYWORD_AUTOMATON = _build_keyword_automaton(LOWERCASE_HTML_KEYWORDS)
+else:
+    HTML_KEYWORD_AUTOMATON = LOWERCASE_HTML_KEYWORD_AUTOMATON = None
+
+
+class TemplateFeatures(NamedTuple):
+    """Counts every complexity and maintainability scorer reads from a template structure"""
+
+    tags: int
+    directives: int
+    bindings: int
+    events: int
+    lines: int
+    binding_expressions: int
+
+
+@lru_cache(maxsize=4096)
+def _normalize_structure_cached(structure: str) -> str:
+    """Normalizes a template once per distinct string; pairwise comparisons see the same ones repeatedly"""
+    return sys.intern(' '.join(structure.split()))
+
+
+def _levenshtein_distance(s1: str, s2: str) -> int:
+    """Calculates the Levenshtein distance between two strings"""
+    # Repeated components produce identical (interned) structures, so this is the common case
+    if s1 == s2:
+        return 0
+
+    if len(s1) < len(s2):
+        return _levenshtein_distance(s2, s1)
+
+    if len(s2) == 0:
+        return len(s1)
+
+    previous_row = range(len(s2) + 1)
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        previous_row = current_row
+
+    return previous_row[-1]
+
+
+def _count_tags_and_directives(template: str) -> Tuple[int, int]:
+    """Counts '<' characters and *ng directives with C-level str scans instead of a regex"""
+    return template.count('<'), count_directives(template)
+
+
+@lru_cache(maxsize=4096)
+def _html_keyword_hits(html: str) -> frozenset:
+    """The HTML_KEYWORDS (and lowercase keywords) present in an html_structure, found once per distinct string"""
+    lowered = html.lower()
+    if HTML_KEYWORD_AUTOMATON is not None:
+        hits = {keyword for _, keyword in HTML_KEYWORD_AUTOMATON.iter(html)}
+        hits.update(keyword for keyword in SINGLE_CHARACTER_HTML_KEYWORDS if keyword in html)
+        hits.update(keyword for _, keyword in LOWERCASE_HTML_KEYWORD_AUTOMATON.iter(lowered))
+    else:
+        hits = {keyword for keyword in HTML_KEYWORDS if keyword in html}
+        hits.update(keyword for keyword in LOWERCASE_HTML_KEYWORDS if keyword in lowered)
+    return frozenset(hits)
+
+
+@lru_cache(maxsize=4096)
+def _rule_declarations(rules: str) -> frozenset:
+    """Distinct stripped declarations of a CSS rule block, split once per distinct block"""
+    return frozenset(declaration.strip() for declaration in rules.split(';') if declaration.strip())
+
+
+@lru_cache(maxsize=4096)
+def _structural_signature(template: str) -> Tuple[frozenset, frozenset, int]:
+    """Element names, directive names and binding count that _identify_structural_changes compares"""
+    # Kept as separate scans: element matches span whole tags, so a combined alternation would swallow
+    # the directives and bindings inside them
+    return (
+        frozenset(ELEMENT_PATTERN.findall(template)),
+        frozenset(DIRECTIVE_NAME_PATTERN.findall(template)),
+        len(BINDING_PATTERN.findall(template)),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _template_features(template: str) -> TemplateFeatures:
+    """Scans a template once for all scorer counts; groups and helpers revisit the same structures"""
+    tags, directives = _count_tags_and_directives(template)
+    return TemplateFeatures(
+        tags=tags,
+        directives=directives,
+        bindings=len(BINDING_PATTERN.findall(template)),
+        events=len(EVENT_BINDING_PATTERN.findall(template)),
+        lines=template.count('\n') + 1,
+        binding_expressions=len(BINDING_EXPRESSION_PATTERN.findall(template)),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _normalized_structure_similarity(norm1: str, norm2: str) -> float:
+    """Levenshtein similarity of two normalized structures, computed once per distinct pair"""
+    distance = _levenshtein_distance(norm1, norm2)
+    max_length = max(len(norm1), len(norm2))
+
+    if max_length == 0:
+        return 0.0
+
+    return 1 - (distance / max_length)
+
+
+# Per-process analyzer used by _analyze_pattern_group_worker, created on first use
+_WORKER_ANALYZER = {}
+
+
+def _analyze_pattern_group_worker(pattern_name: str, patterns: List[UIPattern]) -> Dict[str, Any]:
+    """Analyzes one pattern group in a worker process"""
+    if 'analyzer' not in _WORKER_ANALYZER:
+        _WORKER_ANALYZER['analyzer'] = PatternAnalyzer()
+    return _WORKER_ANALYZER['analyzer']._analyze_pattern_group(pattern_name, patterns)
+
 
 class PatternAnalyzer:
     def __init__(self):
         self.pattern_registry = {}
+        self._component_sets = {}  # Components touched by each registered pattern group, built once
+        # Memoized per-instance scores; registry-derived entries are reset whenever the registry is rebuilt
+        self._complexity_cache = {}
+        self._similarity_cache = {}
+        self.pattern_groups = {}  # Running pattern groups fed by update()
+        self.total_patterns = 0
         self.similarity_threshold = 0.7  # Configurable similarity threshold
         self.pattern_profiler = PatternProfiler()  # Add profiler
         # Use number of CPU cores for optimal parallelization
         self.max_workers = multiprocessing.cpu_count()
 
-    def _get_pattern_key(self, pattern: UIPattern) -> str:
-        """Creates a hashable key from a pattern"""
-        return f"{pattern.name}:{hash(pattern.template_structure)}"
+    def _get_pattern_key(self, pattern: UIPattern) -> Tuple[str, tuple]:
+        """Creates a hashable key from everything similarity scoring reads from a pattern"""
+        # UIPattern equality ignores styles, so the pattern itself is not a safe cache key
+        return pattern.template_structure, tuple(pattern.associated_styles.items())
 
-    @lru_cache(maxsize=1000)
     def _calculate_complexity_score(self, pattern_name: str) -> float:
         """Cached complexity calculation"""
+        if pattern_name in self._complexity_cache:
+            return self._complexity_cache[pattern_name]
+
+        self._complexity_cache[pattern_name] = score = self._score_pattern_group(pattern_name)
+        return score
+
+    def _score_pattern_group(self, pattern_name: str) -> float:
+        """Averages the weighted complexity of every pattern in a registered group"""
         patterns = self.pattern_registry[pattern_name]
         if not patterns:
             return 0.0
 
-        total_score = 0.0
-        for pattern in patterns:
-            template_complexity = self._calculate_template_complexity(pattern)
-            style_complexity = self._calculate_style_complexity(pattern)
-            logic_complexity = self._calculate_logic_complexity(pattern)
+        # Groups are mostly repeats of a few variations, so each distinct one is scored once
+        keys = [(pattern.template_structure, tuple(pattern.associated_styles.values())) for pattern in patterns]
+        scores = {}
+        for key, pattern in zip(keys, patterns):
+            if key not in scores:
+                template_complexity = self._calculate_template_complexity(pattern)
+                style_complexity = self._calculate_style_complexity(pattern)
+                logic_complexity = self._calculate_logic_complexity(pattern)
 
-            # Weight the different complexity factors
-            total_score += template_complexity * 0.4 + style_complexity * 0.3 + logic_complexity * 0.3
+                # Weight the different complexity factors
+                scores[key] = template_complexity * 0.4 + style_complexity * 0.3 + logic_complexity * 0.3
 
-        return total_score / len(patterns)
+        # sum() adds in pattern order like the old running total, so the float result is unchanged
+        return sum(map(scores.__getitem__, keys)) / len(patterns)
 
-    @lru_cache(maxsize=1000)
     def _calculate_similarity(self, pattern1: UIPattern, pattern2: UIPattern) -> float:
         """Calculates similarity between two patterns"""
+        key = (self._get_pattern_key(pattern1), self._get_pattern_key(pattern2))
+        if key not in self._similarity_cache:
+            self._similarity_cache[key] = self._score_similarity(pattern1, pattern2)
+        return self._similarity_cache[key]
+
+    def _score_similarity(self, pattern1: UIPattern, pattern2: UIPattern) -> float:
+        """Weighs structure and style similarity of two patterns"""
         # Calculate structure similarity
         struct_similarity = self._compare_structures(pattern1.template_structure, pattern2.template_structure)
 
@@ -52,62 +258,81 @@ class PatternAnalyzer:
 
     def analyze_patterns(self, patterns: List[UIPattern]) -> Dict[str, Any]:
         """Analyzes patterns using parallel processing and batching"""
-        print("\nStarting pattern analysis...")
-        print(f"Input patterns count: {len(patterns)}")
-
-        # Group patterns by type for efficient processing
-        pattern_groups = {}
+        self.pattern_groups = {}
+        self.total_patterns = 0
+        self.update(patterns)
+        return self.finalize()
+
+    def update(self, patterns: Iterable[UIPattern]):
+        """Adds a batch of patterns to the running pattern groups"""
+        # Group patterns by type for efficient processing; one bound setdefault call per pattern
+        group_for = self.pattern_groups.setdefault
+        count = 0
         for pattern in patterns:
-            if pattern.name not in pattern_groups:
-                pattern_groups[pattern.name] = []
-            pattern_groups[pattern.name].append(pattern)
-
-        print(f"Registered {len(pattern_groups)} pattern types")
-        print(f"Registered pattern types: {list(pattern_groups.keys())}")
-
-        # Process each pattern type in parallel
-        with ThreadPoolExecutor(max_workers=min(len(pattern_groups), 4)) as executor:
-            future_to_pattern = {
-                executor.submit(self._analyze_pattern_group, name, group): name
-                for name, group in pattern_groups.items()
-            }
-
-            results = {}
-            for future in as_completed(future_to_pattern):
-                pattern_name = future_to_pattern[future]
-                try:
-                    result = future.result()
-                    if result:
-                        # Add required fields for template
-                        result.update(
-                            {
-                                'maintainability_index': self._calculate_maintainability(pattern_groups[pattern_name]),
-                                'template_structure': pattern_groups[pattern_name][0].template_structure,
-                                'complexity_breakdown': {
-                                    'template': result['complexity'] * 30,  # Scale for display
-                                    'styles': len(pattern_groups[pattern_name][0].associated_styles) * 10,
-                                    'logic': result['complexity'] * 20,
-                                },
-                            }
-                        )
-                        results[pattern_name] = result
-                        print(f"Analysis complete for {pattern_name}")
-                except Exception as e:
-                    print(f"Error analyzing {pattern_name}: {str(e)}")
+            group_for(pattern.name, []).append(pattern)
+            count += 1
+        self.total_patterns += count
+
+    def finalize(self) -> Dict[str, Any]:
+        """Analyzes all patterns collected through update()"""
+        pattern_groups = self.pattern_groups
+
+        # Progress output goes through logging, so nothing is formatted unless debug output is enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Starting pattern analysis...")
+            logger.debug(f"Input patterns count: {self.total_patterns}")
+            logger.debug(f"Registered {len(pattern_groups)} pattern types")
+            logger.debug(f"Registered pattern types: {list(pattern_groups.keys())}")
+
+        results = {}
+        if self.total_patterns < PARALLEL_ANALYSIS_MIN_PATTERNS or len(pattern_groups) < 2:
+            # Small runs are analyzed in-process; starting workers and pickling groups would cost more
+            for pattern_name, group in pattern_groups.items():
+                self._store_group_result(results, pattern_name, self._analyze_pattern_group(pattern_name, group))
+        else:
+            # Group analysis is pure-Python string work, so separate processes sidestep the GIL
+            with ProcessPoolExecutor(max_workers=min(len(pattern_groups), self.max_workers)) as executor:
+                futures = {
+                    pattern_name: executor.submit(_analyze_pattern_group_worker, pattern_name, group)
+                    for pattern_name, group in pattern_groups.items()
+                }
+                for pattern_name, future in futures.items():
+                    try:
+                        self._store_group_result(results, pattern_name, future.result())
+                    except Exception as e:
+                        print(f"Error analyzing {pattern_name}: {str(e)}")
 
         return {
             'patterns': results,
-            'summary': {'total_patterns_detected': len(patterns), 'unique_pattern_types': len(results)},
+            'summary': {'total_patterns_detected': self.total_patterns, 'unique_pattern_types': len(results)},
         }
 
+    def _store_group_result(self, results: Dict[str, Any], pattern_name: str, result: Dict[str, Any]):
+        """Keeps a group's analysis unless the group failed"""
+        if result:
+            results[pattern_name] = result
+            logger.debug("Analysis complete for %s", pattern_name)
+
     def _analyze_pattern_group(self, pattern_name: str, patterns: List[UIPattern]) -> Dict[str, Any]:
         """Analyzes a group of patterns of the same type"""
         try:
+            base_pattern = patterns[0]
+            complexity = self._calculate_complexity(base_pattern.template_structure)
+
+            # Every field is computed here, in the worker, so the collecting loop does no further analysis
             return {
                 'total_usage': len(patterns),
-                'complexity': self._calculate_complexity(patterns[0].template_structure),
+                'complexity': complexity,
                 'best_practices_score': self._evaluate_best_practices(patterns),
                 'variations': len(set(p.template_structure for p in patterns)),
+                # Add required fields for template
+                'maintainability_index': self._calculate_maintainability(patterns),
+                'template_structure': base_pattern.template_structure,
+                'complexity_breakdown': {
+                    'template': complexity * 30,  # Scale for display
+                    'styles': len(base_pattern.associated_styles) * 10,
+                    'logic': complexity * 20,
+                },
             }
         except Exception as e:
             print(f"Error in pattern group analysis: {str(e)}")
@@ -143,7 +368,7 @@ class PatternAnalyzer:
             return {
                 'name': pattern_name,
                 'total_usage': len(pattern_list),
-                'component_coverage': len(set().union(*[set(p.components) for p in pattern_list])),
+                'component_coverage': len(self._get_component_set(pattern_name)),
                 'complexity': self._calculate_complexity_score(pattern_name),
                 'accessibility_score': self._calculate_accessibility_score(pattern_list),
                 'maintainability_index': self._calculate_maintainability(pattern_list),
@@ -166,25 +391,41 @@ class PatternAnalyzer:
 
     def _generate_summary(self) -> Dict[str, Any]:
         """Generates analysis summary"""
-        total_patterns = sum(len(patterns) for patterns in self.pattern_registry.values())
+        counts = {name: len(patterns) for name, patterns in self.pattern_registry.items()}
         return {
-            'total_patterns_detected': total_patterns,
+            'total_patterns_detected': sum(counts.values()),
             'unique_pattern_types': len(self.pattern_registry),
-            'most_common_patterns': self._get_most_common_patterns(),
+            'most_common_patterns': self._get_most_common_patterns(counts),
         }
 
-    def _get_most_common_patterns(self) -> List[Dict[str, Any]]:
+    def _get_most_common_patterns(self, counts: Dict[str, int] = None) -> List[Dict[str, Any]]:
         """Gets the most frequently occurring patterns"""
-        common_patterns = []
-        for name, patterns in self.pattern_registry.items():
-            common_patterns.append(
-                {
-                    'name': name,
-                    'frequency': len(patterns),
-                    'components': len(set().union(*[set(p.components) for p in patterns])),
-                }
-            )
-        return sorted(common_patterns, key=lambda x: x['frequency'], reverse=True)[:5]
+        if counts is None:
+            counts = {name: len(patterns) for name, patterns in self.pattern_registry.items()}
+
+        # nlargest keeps ties in registry order like a stable sort, without sorting every group
+        return [
+            {
+                'name': name,
+                'frequency': frequency,
+                'components': len(self._get_component_set(name)),
+            }
+            for name, frequency in heapq.nlargest(5, counts.items(), key=lambda x: x[1])
+        ]
+
+    def _get_component_set(self, pattern_name: str) -> set:
+        """Returns the set of components a registered pattern group appears in"""
+        if pattern_name not in self._component_sets:
+            patterns = self.pattern_registry.get(pattern_name, [])
+            self._component_sets[pattern_name] = self._components_of(patterns)
+        return self._component_sets[pattern_name]
+
+    def _components_of(self, patterns: Iterable[UIPattern]) -> set:
+        """Collects components into one set without building a temporary set per pattern"""
+        components = set()
+        for pattern in patterns:
+            components.update(pattern.components)
+        return components
 
     def _analyze_pattern_relationship(self, name1: str, name2: str) -> Dict[str, Any]:
         """Analyzes relationship between two patterns"""
@@ -195,9 +436,10 @@ class PatternAnalyzer:
             if not pattern1 or not pattern2:
                 return {'strength': 0, 'type': 'none'}
 
+            similarity = self._calculate_similarity(pattern1, pattern2)
             return {
-                'strength': self._calculate_similarity(pattern1, pattern2),
-                'type': self._determine_relationship_type(pattern1, pattern2),
+                'strength': similarity,
+                'type': self._determine_relationship_type(pattern1, pattern2, similarity),
             }
         except Exception as e:
             print(f"Error analyzing relationship between {name1} and {name2}: {str(e)}")
@@ -205,34 +447,34 @@ class PatternAnalyzer:
 
     def _calculate_template_complexity(self, pattern: UIPattern) -> int:
         """Calculate template complexity percentage"""
-        template = pattern.template_structure
-        nesting_depth = template.count('<')
-        directives = len(re.findall(r'\*ng[A-Za-z]+', template))
-        return min(100, (nesting_depth * 5 + directives * 10))
+        features = _template_features(pattern.template_structure)
+        return min(100, (features.tags * 5 + features.directives * 10))
 
     def _calculate_style_complexity(self, pattern: UIPattern) -> int:
         """Calculate style complexity percentage"""
         styles = pattern.associated_styles
         if not styles:
             return 0
-        rules_count = sum(len(rules.split(';')) for rules in styles.values())
+        # A block splits into one more piece than it has semicolons; counting avoids building the pieces
+        rules_count = sum(rules.count(';') + 1 for rules in styles.values())
         return min(100, rules_count * 5)
 
     def _calculate_logic_complexity(self, pattern: UIPattern) -> int:
         """Calculate logic complexity percentage"""
-        template = pattern.template_structure
-        bindings = len(re.findall(r'\{\{[^}]+\}\}', template))
-        events = len(re.findall(r'\([^)]+\)=', template))
-        return min(100, (bindings * 10 + events * 15))
+        features = _template_features(pattern.template_structure)
+        return min(100, (features.bindings * 10 + features.events * 15))
 
-    def _determine_relationship_type(self, pattern1: UIPattern, pattern2: UIPattern) -> str:
+    def _determine_relationship_type(self, pattern1: UIPattern, pattern2: UIPattern, similarity: float = None) -> str:
         """
-        Determines the type of relationship between two patterns
+        Determines the type of relationship between two patterns; callers that already scored
+        the pair pass the similarity in
         """
         if pattern1.html_structure in pattern2.html_structure:
             return 'nested_child'
         elif pattern2.html_structure in pattern1.html_structure:
             return 'nested_parent'
+        elif similarity is not None:
+            return 'similar' if similarity > self.similarity_threshold else 'co_occurring'
         elif self._calculate_similarity(pattern1, pattern2) > self.similarity_threshold:
             return 'similar'
         return 'co_occurring'
@@ -245,17 +487,21 @@ class PatternAnalyzer:
             return 0.0
 
         # Normalize structures
-        norm1 = re.sub(r'\s+', ' ', struct1).strip()
-        norm2 = re.sub(r'\s+', ' ', struct2).strip()
+        norm1 = self._normalize_structure(struct1)
+        norm2 = self._normalize_structure(struct2)
 
-        # Calculate Levenshtein distance
-        distance = self._levenshtein_distance(norm1, norm2)
-        max_length = max(len(norm1), len(norm2))
+        # Normalized structures are interned, so identical templates are the same object
+        if norm1 is norm2 and norm1:
+            return 1.0
 
-        if max_length == 0:
-            return 0.0
+        # The score is symmetric, so ordering the pair lets (a, b) and (b, a) share one cache entry
+        if norm1 > norm2:
+            norm1, norm2 = norm2, norm1
+        return _normalized_structure_similarity(norm1, norm2)
 
-        return 1 - (distance / max_length)
+    def _normalize_structure(self, structure: str) -> str:
+        """Collapses whitespace runs to single spaces; split() does this in one C-level pass"""
+        return _normalize_structure_cached(structure)
 
     def _compare_styles(self, styles1: Dict[str, str], styles2: Dict[str, str]) -> float:
         """
@@ -279,39 +525,18 @@ class PatternAnalyzer:
         """
         Compares two CSS rule sets for similarity
         """
-        rules1_set = set(r.strip() for r in rules1.split(';') if r.strip())
-        rules2_set = set(r.strip() for r in rules2.split(';') if r.strip())
+        rules1_set = _rule_declarations(rules1)
+        rules2_set = _rule_declarations(rules2)
 
         if not rules1_set or not rules2_set:
             return 0.0
 
+        # The union size follows from the intersection, so only one temporary set is built
         intersection = len(rules1_set & rules2_set)
-        union = len(rules1_set | rules2_set)
+        union = len(rules1_set) + len(rules2_set) - intersection
 
         return intersection / union
 
-    def _levenshtein_distance(self, s1: str, s2: str) -> int:
-        """
-        Calculates the Levenshtein distance between two strings
-        """
-        if len(s1) < len(s2):
-            return self._levenshtein_distance(s2, s1)
-
-        if len(s2) == 0:
-            return len(s1)
-
-        previous_row = range(len(s2) + 1)
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-
-        return previous_row[-1]
-
     def _calculate_nesting_level(self, pattern1: UIPattern, pattern2: UIPattern) -> int:
         """
         Calculates the nesting level between two patterns if they are nested
@@ -325,10 +550,13 @@ class PatternAnalyzer:
     def _register_patterns(self, patterns: List[UIPattern]) -> None:
         """Registers patterns from all components into the pattern registry"""
         if not patterns:
-            print("No patterns to register")
+            logger.debug("No patterns to register")
             return
 
         self.pattern_registry = defaultdict(list)  # Reset registry
+        self._component_sets = {}
+        self._complexity_cache = {}
+        self._similarity_cache = {}
 
         # Process each pattern
         for pattern in patterns:
@@ -345,23 +573,27 @@ class PatternAnalyzer:
                         > self.similarity_threshold
                     ):
                         self.pattern_registry[existing_name].append(pattern)
+                        self._component_sets[existing_name].update(pattern.components)
                         similar_found = True
                         break
 
                 if not similar_found:
                     self.pattern_registry[pattern.name] = [pattern]
+                    # Component sets are kept in step with the registry, so no later pass rebuilds them
+                    self._component_sets[pattern.name] = set(pattern.components)
 
             except Exception as e:
                 print(f"Error registering pattern: {str(e)}")
                 continue
 
-        print(f"Registered {len(self.pattern_registry)} pattern types")
+        logger.debug("Registered %d pattern types", len(self.pattern_registry))
 
     def _generate_recommendations(self, pattern_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Generates recommendations based on pattern analysis
         """
         recommendations = []
+        similar_patterns = self._find_similar_structures(pattern_analysis)
 
         for pattern_name, pattern_data in pattern_analysis.items():
             try:
@@ -388,26 +620,15 @@ class PatternAnalyzer:
                     )
 
                 # Check for overlapping patterns
-                for other_name, other_data in pattern_analysis.items():
-                    if pattern_name != other_name:
-                        try:
-                            # Calculate similarity based on template structures
-                            similarity = self._compare_structures(
-                                pattern_data.get('template_structure', ''), other_data.get('template_structure', '')
-                            )
-
-                            if similarity > self.similarity_threshold:
-                                recommendations.append(
-                                    {
-                                        'pattern': pattern_name,
-                                        'message': f'Similar to {other_name}',
-                                        'suggestion': 'Consider merging patterns to reduce duplication',
-                                        'priority': 'medium',
-                                    }
-                                )
-                        except Exception as e:
-                            print(f"Error comparing {pattern_name} with {other_name}: {str(e)}")
-                            continue
+                for other_name in similar_patterns[pattern_name]:
+                    recommendations.append(
+                        {
+                            'pattern': pattern_name,
+                            'message': f'Similar to {other_name}',
+                            'suggestion': 'Consider merging patterns to reduce duplication',
+                            'priority': 'medium',
+                        }
+                    )
 
                 # Check maintainability
                 if pattern_data.get('maintainability_index', 1.0) < 0.5:
@@ -437,6 +658,29 @@ class PatternAnalyzer:
 
         return recommendations
 
+    def _find_similar_structures(self, pattern_analysis: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Lists, per pattern, the other patterns whose template structure is above the similarity threshold"""
+        names = list(pattern_analysis.keys())
+        structures = [pattern_analysis[name].get('template_structure', '') for name in names]
+        similar_patterns = {name: [] for name in names}
+
+        # Structure similarity is symmetric, so each unordered pair is compared once and recorded both ways;
+        # pairs are visited in index order, so every list keeps the registry order of the old nested loop
+        for i, pattern_name in enumerate(names):
+            for j in range(i + 1, len(names)):
+                other_name = names[j]
+                try:
+                    similarity = self._compare_structures(structures[i], structures[j])
+                except Exception as e:
+                    print(f"Error comparing {pattern_name} with {other_name}: {str(e)}")
+                    continue
+
+                if similarity > self.similarity_threshold:
+                    similar_patterns[pattern_name].append(other_name)
+                    similar_patterns[other_name].append(pattern_name)
+
+        return similar_patterns
+
     def _calculate_accessibility_score(self, patterns: List[UIPattern]) -> float:
         """
         Calculates accessibility score based on WCAG guidelines and best practices
@@ -446,38 +690,40 @@ class PatternAnalyzer:
 
         total_score = 0.0
         for pattern in patterns:
+            # One keyword scan per distinct HTML answers every check below
+            hits = _html_keyword_hits(pattern.html_structure)
+
             # Initialize score components
             score = 0.0
             checks = 0
 
             # Check for ARIA attributes
-            if 'aria-' in pattern.html_structure or 'role=' in pattern.html_structure:
+            if 'aria-' in hits or 'role=' in hits:
                 score += 1
                 checks += 1
 
             # Check for semantic HTML elements
-            semantic_elements = ['header', 'nav', 'main', 'article', 'section', 'aside', 'footer']
-            for element in semantic_elements:
-                if f'<{element}' in pattern.html_structure:
+            for semantic_tag in SEMANTIC_ELEMENT_TAGS:
+                if semantic_tag in hits:
                     score += 1
                     checks += 1
 
             # Check for form accessibility
-            if '<form' in pattern.html_structure:
-                if 'aria-label' in pattern.html_structure or 'aria-labelledby' in pattern.html_structure:
+            if '<form' in hits:
+                if 'aria-label' in hits or 'aria-labelledby' in hits:
                     score += 1
-                if '<label' in pattern.html_structure:
+                if '<label' in hits:
                     score += 1
                 checks += 2
 
             # Check for image accessibility
-            if '<img' in pattern.html_structure and 'alt=' in pattern.html_structure:
+            if '<img' in hits and 'alt=' in hits:
                 score += 1
                 checks += 1
 
             # Check for button accessibility
-            if '<button' in pattern.html_structure:
-                if 'aria-label' in pattern.html_structure or '>' in pattern.html_structure:
+            if '<button' in hits:
+                if 'aria-label' in hits or '>' in hits:
                     score += 1
                 checks += 1
 
@@ -504,21 +750,20 @@ class PatternAnalyzer:
                 'isolation_score': 0.0,
             }
 
+            features = _template_features(pattern.template_structure)
+
             # Calculate template complexity
-            template_lines = pattern.template_structure.count('\n') + 1
-            nesting_depth = pattern.template_structure.count('<')
-            factors['template_complexity'] = 1.0 - min((template_lines * nesting_depth) / 100, 1.0)
+            factors['template_complexity'] = 1.0 - min((features.lines * features.tags) / 100, 1.0)
 
             # Calculate style complexity
-            style_rules = sum(len(rules.split(';')) for rules in pattern.associated_styles.values())
+            style_rules = sum(rules.count(';') + 1 for rules in pattern.associated_styles.values())
             factors['style_complexity'] = 1.0 - min(style_rules / 50, 1.0)
 
             # Calculate binding complexity
-            bindings = len(re.findall(r'\{\{[^}]+\}\}|\[(.*?)\]|\((.*?)\)', pattern.template_structure))
-            factors['binding_complexity'] = 1.0 - min(bindings / 20, 1.0)
+            factors['binding_complexity'] = 1.0 - min(features.binding_expressions / 20, 1.0)
 
             # Calculate isolation score
-            isolation_issues = len(re.findall(r'\{\{[^}]+\}\}', pattern.isolated_template))
+            isolation_issues = len(BINDING_PATTERN.findall(pattern.isolated_template))
             factors['isolation_score'] = 1.0 - min(isolation_issues / 10, 1.0)
 
             # Calculate weighted average
@@ -541,24 +786,26 @@ class PatternAnalyzer:
         contexts = []
 
         for pattern in patterns:
+            hits = _html_keyword_hits(pattern.html_structure)
+
             # Check for form context
-            if '<form' in pattern.html_structure:
+            if '<form' in hits:
                 contexts.append('form')
 
             # Check for list context
-            if '*ngFor' in pattern.html_structure:
+            if '*ngFor' in hits:
                 contexts.append('list')
 
             # Check for navigation context
-            if '<nav' in pattern.html_structure or 'routerLink' in pattern.html_structure:
+            if '<nav' in hits or 'routerLink' in hits:
                 contexts.append('navigation')
 
             # Check for modal/dialog context
-            if 'modal' in pattern.html_structure.lower() or 'dialog' in pattern.html_structure.lower():
+            if 'modal' in hits or 'dialog' in hits:
                 contexts.append('modal')
 
             # Check for card/container context
-            if 'card' in pattern.html_structure.lower() or pattern.template_structure.count('<div') > 2:
+            if 'card' in hits or pattern.template_structure.count('<div') > 2:
                 contexts.append('container')
 
         # Return unique contexts
@@ -573,26 +820,27 @@ class PatternAnalyzer:
 
         total_score = 0.0
         for pattern in patterns:
+            hits = _html_keyword_hits(pattern.html_structure)
             score = 0.0
             checks = 0
 
             # Check for proper event binding
-            if '(click)' in pattern.html_structure:
+            if '(click)' in hits:
                 score += 1
                 checks += 1
 
             # Check for proper property binding
-            if '[' in pattern.html_structure and ']' in pattern.html_structure:
+            if '[' in hits and ']' in hits:
                 score += 1
                 checks += 1
 
             # Check for proper structural directives
-            if '*ngIf' in pattern.html_structure or '*ngFor' in pattern.html_structure:
+            if '*ngIf' in hits or '*ngFor' in hits:
                 score += 1
                 checks += 1
 
             # Check for proper CSS class usage
-            if 'class=' in pattern.html_structure:
+            if 'class=' in hits:
                 score += 1
                 checks += 1
 
@@ -615,7 +863,8 @@ class PatternAnalyzer:
         variations = []
         base_pattern = patterns[0]
 
-        for pattern in patterns[1:]:
+        # islice walks the group in place instead of copying everything after the base pattern
+        for pattern in itertools.islice(patterns, 1, None):
             try:
                 variation = {
                     'similarity_score': self._calculate_similarity(base_pattern, pattern),
@@ -634,25 +883,20 @@ class PatternAnalyzer:
         """Identifies structural differences between two patterns"""
         changes = []
 
-        # Compare element structure
-        elements1 = re.findall(r'<(\w+)[^>]*>', pattern1.template_structure)
-        elements2 = re.findall(r'<(\w+)[^>]*>', pattern2.template_structure)
+        # The base pattern is compared against every variation, so each structure is scanned once
+        elements1, directives1, bindings1 = _structural_signature(pattern1.template_structure)
+        elements2, directives2, bindings2 = _structural_signature(pattern2.template_structure)
 
-        if set(elements1) != set(elements2):
+        # Compare element structure
+        if elements1 != elements2:
             changes.append('element_structure')
 
         # Compare directives
-        directives1 = re.findall(r'\*ng\w+', pattern1.template_structure)
-        directives2 = re.findall(r'\*ng\w+', pattern2.template_structure)
-
-        if set(directives1) != set(directives2):
+        if directives1 != directives2:
             changes.append('directives')
 
         # Compare bindings
-        bindings1 = re.findall(r'\{\{[^}]+\}\}', pattern1.template_structure)
-        bindings2 = re.findall(r'\{\{[^}]+\}\}', pattern2.template_structure)
-
-        if len(bindings1) != len(bindings2):
+        if bindings1 != bindings2:
             changes.append('bindings')
 
         return changes
@@ -661,22 +905,21 @@ class PatternAnalyzer:
         """Identifies style differences between two patterns"""
         changes = []
 
-        # Compare selectors
-        if set(pattern1.associated_styles.keys()) != set(pattern2.associated_styles.keys()):
+        styles1 = pattern1.associated_styles
+        styles2 = pattern2.associated_styles
+
+        # Compare selectors; key views compare as sets without copying the keys
+        if styles1.keys() != styles2.keys():
             changes.append('selectors')
 
         # Compare rules
-        for selector in set(pattern1.associated_styles.keys()) & set(pattern2.associated_styles.keys()):
-            if pattern1.associated_styles[selector] != pattern2.associated_styles[selector]:
+        for selector in styles1.keys() & styles2.keys():
+            if styles1[selector] != styles2[selector]:
                 changes.append('rules')
                 break
 
         return changes
 
     def _calculate_complexity(self, template: str) -> float:
-        nesting_depth = template.count('<')
-        directives = len(re.findall(r'\*ng[A-Za-z]+', template))
-        bindings = len(re.findall(r'\{\{[^}]+\}\}', template))
-        events = len(re.findall(r'\([^)]+\)=', template))
-
-        return round((nesting_depth * 0.5 + directives + bindings * 0.8 + events) / 10)
+        features = _template_features(template)
+        return round((features.tags * 0.5 + features.directives + features.bindings * 0.8 + features.events) / 10)
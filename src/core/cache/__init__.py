@@ -0,0 +1 @@
+from .pattern_cache import PatternCache
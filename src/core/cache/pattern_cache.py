@@ -0,0 +1,65 @@
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from ..extractor.component_extractor import UIPattern
+import hashlib
+import logging
+import pickle
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+# Bump when parser/extractor output changes so stale entries are never served
+CACHE_VERSION = b'3'
+
+
+class PatternCache:
+    def __init__(self, db_path: Path = Path('.pattern-cache.sqlite')):
+        self.db_path = db_path
+        # The main loop hands the cache to its producer thread, so allow cross-thread use
+        self.connection = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS entries(path TEXT, sha TEXT, patterns BLOB, PRIMARY KEY(path, sha))'
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def compute_digest(sources: Dict[str, Any]) -> str:
+        """Hashes the raw component sources so any content change invalidates the entry"""
+        digest = hashlib.sha256(CACHE_VERSION)
+        for source in [sources['typescript'], sources['template'], *sources['styles']]:
+            # Length prefix keeps boundaries between files unambiguous
+            data = source or b''
+            digest.update(len(data).to_bytes(8, 'little'))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, path: str, sha: str) -> Optional[List[UIPattern]]:
+        """Returns cached patterns for a component, or None on a miss"""
+        row = self.connection.execute('SELECT patterns FROM entries WHERE path=? AND sha=?', (path, sha)).fetchone()
+        if row is None:
+            return None
+
+        # Entries are unpickled, so the cache file must be one this user wrote (see --cache-path)
+        try:
+            return pickle.loads(row[0])
+        except Exception as e:
+            logger.warning(f"Error reading cache entry for {path}: {str(e)}")
+            return None
+
+    def put_many(self, entries: List[Tuple[str, str, List[UIPattern]]]):
+        """Stores a batch of (path, sha, patterns) entries in a single transaction, replacing older shas"""
+        if not entries:
+            return
+
+        with self.connection:
+            # Only the latest sha of a path can hit again, so older entries are dropped instead of piling up
+            self.connection.executemany(
+                'DELETE FROM entries WHERE path=? AND sha<>?', [(path, sha) for path, sha, _ in entries]
+            )
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO entries(path, sha, patterns) VALUES (?, ?, ?)',
+                [(path, sha, pickle.dumps(patterns)) for path, sha, patterns in entries],
+            )
+
+    def close(self):
+        self.connection.close()
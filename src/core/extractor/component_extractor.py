@@ -1,12 +1,37 @@
-from typing import Dict, Any, List
+from typing import Dict, Iterable, List, Tuple
 import re
+from collections import Counter, OrderedDict, defaultdict
 from dataclasses import dataclass, field
-from bs4 import BeautifulSoup
 from functools import lru_cache
 from pathlib import Path
-
-
-@dataclass(frozen=True)
+import hashlib
+import logging
+import sys
+from ..parser.angular_parser import ComponentInfo
+
+try:
+    # Optional fast non-cryptographic hash for the template cache keys
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    # Optional Aho-Corasick automaton for the structure containment checks; plain substring checks otherwise
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    # Optional linear-time (DFA-based) engine for the structural patterns
+    import re2 as structural_regex_engine
+except ImportError:
+    structural_regex_engine = re
+
+logger = logging.getLogger(__name__)
+
+
+# Slots drop the per-instance __dict__, which adds up over the tens of thousands of patterns a large project yields
+@dataclass(frozen=True, slots=True)
 class UIPattern:
     name: str
     frequency: int
@@ -34,51 +59,194 @@ class UIPattern:
         )
 
 
+# '*ng' not followed by a letter, the only occurrences of the literal that \*ng[A-Za-z]+ does not match
+BARE_DIRECTIVE_PREFIX_PATTERN = re.compile(r'\*ng(?![A-Za-z])')
+
+
+def count_directives(template: str) -> int:
+    """Counts *ng directives (matches of \\*ng[A-Za-z]+) without building a list of every directive name"""
+    # Matches never overlap, so each '*ng' followed by a letter is exactly one match
+    count = template.count('*ng')
+    if count:
+        count -= len(BARE_DIRECTIVE_PREFIX_PATTERN.findall(template))
+    return count
+
+
+STRUCTURAL_PATTERNS = {
+    'data-list': r'\*ngFor\s*=\s*"[^"]*"',
+    'conditional-content': r'\*ngIf\s*=\s*"[^"]*"',
+    'form-group': r'<form[^>]*>.*?</form>',
+    'input-field': r'<input[^>]*>',
+    'action-button': r'<button[^>]*>.*?</button>',
+    'data-binding': r'\{\{[^}]+\}\}'
+}
+# Precompile regular expressions once at import; DOTALL is inlined so both engines accept it
+COMPILED_STRUCTURAL_PATTERNS = {
+    name: structural_regex_engine.compile(f'(?s){pattern}') for name, pattern in STRUCTURAL_PATTERNS.items()
+}
+# Literal every match of the pattern must contain; a template without it cannot match
+STRUCTURAL_PATTERN_ANCHORS = {
+    'data-list': '*ngFor',
+    'conditional-content': '*ngIf',
+    'form-group': '<form',
+    'input-field': '<input',
+    'action-button': '<button',
+    'data-binding': '{{',
+}
+# Class attribute of an element, read straight from the markup. Quoted values are consumed whole so a '>' or
+# ' class=' inside another attribute is not mistaken for the tag end or the class attribute, and the greedy scan
+# picks the last class attribute of a tag like BeautifulSoup did. Comments are matched (without a class group)
+# only so that tags inside them are skipped.
+CLASS_ATTRIBUTE_PATTERN = re.compile(
+    r"""<!--.*?-->|<[a-zA-Z](?:[^'">]|"[^"]*"|'[^']*')*\sclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s'">]+))""",
+    re.IGNORECASE | re.DOTALL,
+)
+# Rewrites applied by _isolate_template, compiled once instead of on every call
+PROPERTY_BINDING_PATTERN = re.compile(r'\[(\w+)\]="[^"]*"')
+INTERPOLATION_PATTERN = re.compile(r'\{\{[^}]+\}\}')
+# Used by _extract_template_structure. Directive names start with '*', which the attribute name class can never
+# match, so *ngIf / *ngFor (and every other structural directive) are kept without a lookahead
+PLAIN_ATTRIBUTE_PATTERN = re.compile(r'\s+[a-zA-Z0-9-]+="[^"]*"')
+TEXT_CONTENT_PATTERN = re.compile(r'>([^<]+)<')
+# Custom component elements (tag names with a dash), used by _extract_composition_patterns
+CUSTOM_COMPONENT_PATTERN = re.compile(r'<([a-z]+-[a-z-]+)[^>]*>')
+# Number of templates whose extracted patterns are kept by each extractor
+TEMPLATE_CACHE_SIZE = 2048
+
+
+def _template_digest(template: str) -> bytes:
+    """Content hash of a template, used instead of the template itself as a cache key"""
+    data = template.encode('utf-8', 'surrogatepass')
+    if xxhash is not None:
+        return xxhash.xxh128_digest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+BRACE_PATTERN = re.compile(r'[{}]')
+
+
+@lru_cache(maxsize=256)
+def _parse_stylesheet(style: str) -> Dict[str, str]:
+    """Maps every selector a stylesheet rule ends with to its declarations, later rules winning"""
+    # `.card .title {` is found under both '.card .title' and '.title'. A rule nested inside an earlier body of
+    # the same selector is skipped, as the non-overlapping findall this replaces would have done.
+    rules = {}
+    match_ends = {}
+    last_brace = -1
+    for brace in BRACE_PATTERN.finditer(style):
+        position = brace.start()
+        if brace.group() == '{':
+            close = style.find('}', position + 1)
+            if close == -1:
+                break
+            declarations = style[position + 1 : close]
+            # Selectors cannot span braces, so only the text since the previous brace can hold one
+            selector_text = style[last_brace + 1 : position].rstrip()
+            if declarations:
+                dot = selector_text.find('.')
+                while dot != -1:
+                    selector = selector_text[dot:]
+                    if position > match_ends.get(selector, -1):
+                        match_ends[selector] = close
+                        rules[selector] = declarations.strip()
+                    dot = selector_text.find('.', dot + 1)
+        last_brace = position
+    return rules
+
+
+# Derived views of a pattern's HTML. UIPattern defers them (isolated_template and selector_path stay empty until
+# asked for), and as pure functions of the fragment they are computed once per distinct fragment when they are.
+@lru_cache(maxsize=4096)
+def _isolate_template(html: str) -> str:
+    """Isolates a pattern template by removing external dependencies"""
+    # Each rewrite is skipped when the literal every match must contain is absent
+    isolated = html
+    # Remove component-specific bindings
+    if ']="' in isolated:
+        isolated = PROPERTY_BINDING_PATTERN.sub(r'\1=""', isolated)
+    # Replace complex bindings with placeholders
+    if '{{' in isolated:
+        isolated = INTERPOLATION_PATTERN.sub('{{placeholder}}', isolated)
+    return isolated
+
+
+@lru_cache(maxsize=4096)
+def _extract_selector_path(html: str) -> str:
+    """Extracts CSS selector path for the pattern"""
+    selectors = []
+    for match in CLASS_ATTRIBUTE_PATTERN.finditer(html):
+        classes = (match.group(1) or match.group(2) or match.group(3) or '').split()
+        if classes:
+            selectors.append(f".{'.'.join(classes)}")
+    return ' '.join(selectors)
+
+
+@lru_cache(maxsize=4096)
+def _extract_template_structure(template_fragment: str) -> str:
+    """Extracts the basic structure of a template fragment"""
+    # Each rewrite is skipped when the literals every match must contain are absent
+    structure = template_fragment
+    # Remove attributes but keep structural directives
+    if '="' in structure:
+        structure = PLAIN_ATTRIBUTE_PATTERN.sub('', structure)
+    # Remove content but keep element structure
+    if '>' in structure and '<' in structure:
+        structure = TEXT_CONTENT_PATTERN.sub('><', structure)
+    return structure
+
+
 class ComponentExtractor:
+    structural_patterns = STRUCTURAL_PATTERNS
+    compiled_patterns = COMPILED_STRUCTURAL_PATTERNS
+
     def __init__(self):
-        self.structural_patterns = {
-            'data-list': r'\*ngFor\s*=\s*"[^"]*"',
-            'conditional-content': r'\*ngIf\s*=\s*"[^"]*"',
-            'form-group': r'<form[^>]*>.*?</form>',
-            'input-field': r'<input[^>]*>',
-            'action-button': r'<button[^>]*>.*?</button>',
-            'data-binding': r'\{\{[^}]+\}\}'
-        }
-        # Precompile regular expressions
-        self.compiled_patterns = {
-            name: re.compile(pattern, re.DOTALL) for name, pattern in self.structural_patterns.items()
-        }
+        # Extracted patterns per (template digest, class name), least recently used first
+        self._template_cache: OrderedDict[Tuple[bytes, str], List[UIPattern]] = OrderedDict()
 
-    def extract_patterns(self, component_data: Dict[str, Any]) -> List[UIPattern]:
-        """Extracts UI patterns from a parsed component using chunking"""
+    def extract_patterns(self, component_data: ComponentInfo) -> List[UIPattern]:
+        """Extracts UI patterns from a parsed component"""
         patterns = []
-        template = component_data.get('template', '')
-        class_name = component_data.get('class_name', 'Unknown')
+        template = component_data.template
+        class_name = component_data.class_name
 
         if not template:
             return patterns
 
-        # Process template in chunks
-        chunk_size = 5000
-        chunks = [template[i : i + chunk_size] for i in range(0, len(template), chunk_size)]
-
-        for chunk in chunks:
-            chunk_patterns = self._extract_chunk_patterns(chunk, class_name)
-            patterns.extend(chunk_patterns)
+        # One scan over the whole template; fixed-size chunks used to lose matches that crossed a chunk boundary
+        patterns.extend(self._extract_template_patterns(template, class_name))
 
         # Process styles in bulk after pattern detection
         if patterns:
-            styles = component_data.get('styles', [])
+            styles = component_data.styles
             self._bulk_process_styles(patterns, styles)
 
         return patterns
 
-    @lru_cache(maxsize=500)
-    def _extract_chunk_patterns(self, template_chunk: str, component_class_name: str = "Unknown") -> List[UIPattern]:
-        """Cached pattern extraction for template chunks"""
+    def _extract_template_patterns(self, template: str, component_class_name: str = "Unknown") -> List[UIPattern]:
+        """Cached pattern extraction for a template"""
+        key = (_template_digest(template), component_class_name)
+        cached = self._template_cache.get(key)
+        if cached is not None:
+            self._template_cache.move_to_end(key)
+            return cached
+
+        patterns = self._scan_template_patterns(template, component_class_name)
+        self._template_cache[key] = patterns
+        if len(self._template_cache) > TEMPLATE_CACHE_SIZE:
+            self._template_cache.popitem(last=False)
+        return patterns
+
+    def _scan_template_patterns(self, template: str, component_class_name: str) -> List[UIPattern]:
+        """Runs the structural patterns over a template"""
         patterns = []
+        # One pass per pattern on purpose: each pattern starts with a literal the engine scans for directly, which
+        # beats a single combined alternation (no literal prefix, and lookaheads would be needed to keep overlaps)
         for pattern_name, compiled_regex in self.compiled_patterns.items():
-            matches = compiled_regex.finditer(template_chunk)
+            # Cheap substring probe before running the regex over the template
+            if STRUCTURAL_PATTERN_ANCHORS[pattern_name] not in template:
+                continue
+
+            matches = compiled_regex.finditer(template)
             for match in matches:
                 pattern_html = match.group(0)
 
@@ -99,42 +267,28 @@ class ComponentExtractor:
 
     def _isolate_template(self, html: str) -> str:
         """Isolates a pattern template by removing external dependencies"""
-        # Remove component-specific bindings
-        isolated = re.sub(r'\[(\w+)\]="[^"]*"', r'\1=""', html)
-        # Replace complex bindings with placeholders
-        isolated = re.sub(r'\{\{[^}]+\}\}', '{{placeholder}}', isolated)
-        return isolated
+        return _isolate_template(html)
 
     def _extract_selector_path(self, html: str) -> str:
         """Extracts CSS selector path for the pattern"""
-        soup = BeautifulSoup(html, 'html.parser')
-        selectors = []
-        for element in soup.find_all():
-            classes = element.get('class', [])
-            if classes:
-                selectors.append(f".{'.'.join(classes)}")
-        return ' '.join(selectors)
+        return _extract_selector_path(html)
 
     def _extract_associated_styles(self, selector_path: str, styles: List[str]) -> Dict[str, str]:
         """Extracts styles associated with the pattern"""
         associated_styles = {}
         for style in styles:
             # Basic CSS parsing - could be enhanced with a proper CSS parser
+            style_rules = _parse_stylesheet(style)
             for selector in selector_path.split():
-                css_rules = re.findall(rf'{selector}\s*\{{([^}}]+)\}}', style)
-                for rules in css_rules:
-                    associated_styles[selector] = rules.strip()
+                if selector in style_rules:
+                    associated_styles[selector] = style_rules[selector]
         return associated_styles
 
     def _extract_template_structure(self, template_fragment: str) -> str:
         """
         Extracts the basic structure of a template fragment
         """
-        # Remove attributes but keep structural directives
-        structure = re.sub(r'\s+(?![\*ngIf|\*ngFor])[a-zA-Z0-9-]+="[^"]*"', '', template_fragment)
-        # Remove content but keep element structure
-        structure = re.sub(r'>([^<]+)<', '><', structure)
-        return structure
+        return _extract_template_structure(template_fragment)
 
     def _extract_composition_patterns(self, template: str) -> List[UIPattern]:
         """
@@ -143,16 +297,12 @@ class ComponentExtractor:
         patterns = []
 
         # Find custom components (elements with dash in name)
-        custom_components = re.finditer(r'<([a-z]+-[a-z-]+)[^>]*>', template)
-
-        component_usage = {}
-        for match in custom_components:
-            component_name = match.group(1)
-            component_usage[component_name] = component_usage.get(component_name, 0) + 1
+        # Counter keeps first-seen order, so patterns come out in the order components first appear
+        component_usage = Counter(match.group(1) for match in CUSTOM_COMPONENT_PATTERN.finditer(template))
 
         for component_name, frequency in component_usage.items():
             pattern = UIPattern(
-                name=f"component-usage-{component_name}",
+                name=sys.intern(f"component-usage-{component_name}"),
                 frequency=frequency,
                 variations=(),
                 components=(component_name,),
@@ -167,41 +317,77 @@ class ComponentExtractor:
         Analyzes relationships between different patterns
         """
         relationships = {}
-
-        for pattern in patterns:
-            related_patterns = []
-            for other_pattern in patterns:
-                if pattern != other_pattern and self._are_patterns_related(pattern, other_pattern):
-                    related_patterns.append(other_pattern.name)
-
+        related_indices = [set() for _ in patterns]
+
+        # Patterns used together in the same components, found through a component -> patterns index
+        indices_by_component = defaultdict(list)
+        for i, pattern in enumerate(patterns):
+            for component in set(pattern.components):
+                indices_by_component[component].append(i)
+        for indices in indices_by_component.values():
+            for i in indices:
+                related_indices[i].update(indices)
+
+        # Patterns where one structure contains the other, checked once per distinct structure
+        indices_by_structure = defaultdict(list)
+        for i, pattern in enumerate(patterns):
+            indices_by_structure[pattern.template_structure].append(i)
+        for structure, contained_structures in self._find_contained_structures(indices_by_structure).items():
+            outer = indices_by_structure[structure]
+            for contained in contained_structures:
+                inner = indices_by_structure[contained]
+                for i in outer:
+                    related_indices[i].update(inner)
+                for i in inner:
+                    related_indices[i].update(outer)
+
+        # A pattern is never related to an equal one. Numbering the equality classes once turns that test into
+        # an int comparison instead of a four-field __eq__ per related pair
+        equality_classes = {}
+        class_ids = [equality_classes.setdefault(pattern, len(equality_classes)) for pattern in patterns]
+
+        # Sorted indices keep each list in input order
+        for pattern, class_id, indices in zip(patterns, class_ids, related_indices):
+            related_patterns = [patterns[j].name for j in sorted(indices) if class_ids[j] != class_id]
             if related_patterns:
                 relationships[pattern.name] = related_patterns
 
         return relationships
 
-    def _are_patterns_related(self, pattern1: UIPattern, pattern2: UIPattern) -> bool:
-        """
-        Determines if two patterns are related based on their structure and usage
-        """
-        # Check if patterns are used together in the same components
-        common_components = set(pattern1.components) & set(pattern2.components)
-        if common_components:
-            return True
-
-        # Check if one pattern's structure contains the other
-        return (
-            pattern1.template_structure in pattern2.template_structure
-            or pattern2.template_structure in pattern1.template_structure
-        )
+    def _find_contained_structures(self, structures: Iterable[str]) -> Dict[str, List[str]]:
+        """Maps each distinct structure to the structures it contains, itself included"""
+        structures = list(structures)
+        # The empty structure is contained in every structure, but an automaton cannot hold it
+        words = [structure for structure in structures if structure]
+        if ahocorasick is not None and words:
+            # One automaton over every structure reports all the others found in a structure in a single scan
+            automaton = ahocorasick.Automaton()
+            for word in words:
+                automaton.add_word(word, word)
+            automaton.make_automaton()
+            has_empty = len(words) < len(structures)
+            contained = {}
+            for structure in structures:
+                found = {word for _, word in automaton.iter(structure)}
+                if has_empty:
+                    found.add('')
+                contained[structure] = list(found)
+            return contained
+
+        # A structure can only contain structures that are not longer than itself
+        by_length = sorted(structures, key=len)
+        return {
+            structure: [other for other in by_length[:position] if other in structure] + [structure]
+            for position, structure in enumerate(by_length)
+        }
 
     def validate_project_path(self, path: Path) -> bool:
         """Validates if the given path contains Angular components."""
         if not path.exists():
             return False
 
-        # For sample projects, just check if we have component files
-        component_files = list(path.rglob("*.component.ts"))
-        return len(component_files) > 0
+        # For sample projects, just check if we have component files; the walk stops at the first one
+        return next(path.rglob("*.component.ts"), None) is not None
 
     def find_component_files(self, base_path: Path) -> List[Path]:
         """Finds all Angular component files"""
@@ -214,10 +400,12 @@ class ComponentExtractor:
         print(f"Found {len(all_ts_files)} potential component files")
 
         component_files = []
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         for file_path in all_ts_files:
             if self._is_valid_component(file_path):
                 component_files.append(file_path)
-                print(f"Valid component found: {file_path}")
+                if debug_enabled:
+                    logger.debug(f"Valid component found: {file_path}")
 
         if not component_files:
             print("No valid Angular components found after validation")
@@ -229,13 +417,14 @@ class ComponentExtractor:
     def _is_valid_component(self, file_path: Path) -> bool:
         """Validates if a file is an Angular component file"""
         try:
-            # Read the file content directly for small files
-            content = file_path.read_text()
+            # The decorator check works on the raw bytes, so the file is never decoded
+            content = file_path.read_bytes()
 
-            # Debug output
-            print(f"Validating component: {file_path}")
-            has_component = '@Component' in content
-            print(f"Has @Component decorator: {has_component}")
+            # Per-file output goes through logging, so nothing is formatted unless debug output is enabled
+            has_component = b'@Component' in content
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Validating component: {file_path}")
+                logger.debug(f"Has @Component decorator: {has_component}")
 
             return has_component
 
@@ -281,7 +470,7 @@ class ComponentExtractor:
 
         # Process all styles at once
         for style in styles:
+            style_rules = _parse_stylesheet(style)
             for selector, pattern in selector_map.items():
-                css_rules = re.findall(rf'{selector}\s*\{{([^}}]+)\}}', style)
-                for rules in css_rules:
-                    pattern.associated_styles[selector] = rules.strip()
+                if selector in style_rules:
+                    pattern.associated_styles[selector] = style_rules[selector]
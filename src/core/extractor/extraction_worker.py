@@ -0,0 +1,30 @@
+from pathlib import Path
+from typing import List, Dict, Any
+from ..parser.angular_parser import AngularParser
+from .component_extractor import ComponentExtractor, UIPattern
+
+# Per-process parser and extractor, created once by init_worker
+_WORKER = {}
+
+
+def init_worker():
+    """Creates the parser and extractor once per worker process"""
+    _WORKER['parser'] = AngularParser()
+    _WORKER['extractor'] = ComponentExtractor()
+
+
+def extract_component(related_files: Dict[str, Path]) -> List[UIPattern]:
+    """Parses one component from its files and extracts its patterns (runs in a worker process)"""
+    component_data = _WORKER['parser'].parse_component(related_files)
+    return _WORKER['extractor'].extract_patterns(component_data)
+
+
+def process_component(sources: Dict[str, Any]) -> List[UIPattern]:
+    """Parses a single component's sources and extracts its patterns (runs in a worker process)"""
+    component_data = _WORKER['parser'].parse_component_sources(sources)
+    return _WORKER['extractor'].extract_patterns(component_data)
+
+
+def process_components(sources_list: List[Dict[str, Any]]) -> List[List[UIPattern]]:
+    """Processes a chunk of components in one task to cut IPC round-trips"""
+    return [process_component(sources) for sources in sources_list]
@@ -1 +1 @@
-from .angular_parser import AngularParser
+from .angular_parser import AngularParser, ComponentInfo
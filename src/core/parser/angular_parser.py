@@ -1,31 +1,126 @@
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field
+import os
 import re
 
+# Compiled once at import so every parser instance (and forked worker) shares them
+CLASS_PATTERN = re.compile(r'export\s+class\s+(\w+)')
+SELECTOR_PATTERN = re.compile(r'selector\s*:\s*[\'"]([^\'"]+)[\'"]')
+TEMPLATE_URL_PATTERN = re.compile(r'templateUrl\s*:\s*[\'"]([^\'"]+)[\'"]')
+PROPERTY_PATTERN = re.compile(r'@Input\(\)\s+(\w+)')
+# Anchored at a word start: a match can never begin mid-word (the rest of the word would have to be followed by the
+# same '('), so the anchor only saves the engine retrying at every character of every identifier
+METHOD_PATTERN = re.compile(r'\b(\w+)\s*\([^)]*\)\s*{')
+# Tokens the @Component brace scanner cares about: braces, plus comments and string literals (with escapes) to step
+# over, so an apostrophe in a comment never opens a string
+BRACE_SCAN_TOKEN_PATTERN = re.compile(
+    r'[{}]|//[^\n]*|/\*.*?\*/|\'(?:[^\'\\]|\\.)*\'|"(?:[^"\\]|\\.)*"|`(?:[^`\\]|\\.)*`', re.DOTALL
+)
+
+
+def _read_file_bytes(path: Path) -> bytes:
+    """Reads a whole file through a raw descriptor, skipping the buffered file object open() would build"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        chunks = []
+        # One read normally returns everything; keep reading in case the file was short-read or grew
+        while True:
+            chunk = os.read(fd, max(size, 1 << 16))
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b''.join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _find_component_metadata(content: str) -> Optional[str]:
+    """Returns the body of the object literal passed to @Component, or None when there is none"""
+    start = content.find('@Component')
+    while start != -1:
+        # Only whitespace may separate the decorator, its parenthesis and the braces
+        position = _skip_whitespace(content, start + len('@Component'))
+        if content.startswith('(', position):
+            opening = _skip_whitespace(content, position + 1)
+            if content.startswith('{', opening):
+                closing = _find_closing_brace(content, opening)
+                if closing != -1 and content.startswith(')', _skip_whitespace(content, closing + 1)):
+                    return content[opening + 1 : closing]
+        start = content.find('@Component', start + 1)
+    return None
+
+
+def _skip_whitespace(content: str, position: int) -> int:
+    """Index of the first non-whitespace character at or after `position`"""
+    while position < len(content) and content[position].isspace():
+        position += 1
+    return position
+
+
+def _find_closing_brace(content: str, opening: int) -> int:
+    """Index of the brace closing the one at `opening`, or -1 when it is never closed"""
+    depth = 0
+    # Comments and string literals are matched whole, so braces inside them (e.g. an inline template) are not counted
+    for token in BRACE_SCAN_TOKEN_PATTERN.finditer(content, opening):
+        if token.group() == '{':
+            depth += 1
+        elif token.group() == '}':
+            depth -= 1
+            if depth == 0:
+                return token.start()
+    return -1
+
+
+@dataclass(slots=True)
+class ComponentInfo:
+    """A parsed component: its @Component metadata, class details, template and styles"""
+
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    template: str = ''
+    styles: List[str] = field(default_factory=list)
+    class_name: str = ''
+    properties: List[str] = field(default_factory=list)
+    methods: List[str] = field(default_factory=list)
+
 
 class AngularParser:
-    def __init__(self):
-        self.component_metadata_pattern = re.compile(r'@Component\s*\(\s*{([^}]+)}\s*\)')
-        self.class_pattern = re.compile(r'export\s+class\s+(\w+)')
+    class_pattern = CLASS_PATTERN
+    selector_pattern = SELECTOR_PATTERN
+    template_url_pattern = TEMPLATE_URL_PATTERN
+    property_pattern = PROPERTY_PATTERN
+    method_pattern = METHOD_PATTERN
 
-    def parse_component(self, component_files: Dict[str, Path]) -> Dict[str, Any]:
+    def parse_component(self, component_files: Dict[str, Path]) -> ComponentInfo:
         """
         Parses an Angular component and its related files
         """
-        result = {'metadata': {}, 'template': '', 'styles': [], 'class_name': '', 'properties': [], 'methods': []}
-
+        sources = {
+            'typescript': _read_file_bytes(component_files['typescript']) if component_files['typescript'] else None,
+            'template': _read_file_bytes(component_files['template']) if component_files['template'] else None,
+            'styles': [_read_file_bytes(style_file) for style_file in component_files['styles']],
+        }
+        return self.parse_component_sources(sources)
+
+    def parse_component_sources(self, sources: Dict[str, Any]) -> ComponentInfo:
+        """
+        Parses an Angular component from the raw bytes of its related files
+        """
         # Parse TypeScript file
-        if component_files['typescript']:
-            ts_content = component_files['typescript'].read_text()
-            result.update(self._parse_typescript(ts_content))
+        if sources['typescript']:
+            ts_content = sources['typescript'].decode('utf-8')
+            result = ComponentInfo(**self._parse_typescript(ts_content))
+        else:
+            result = ComponentInfo()
 
         # Parse template
-        if component_files['template']:
-            result['template'] = component_files['template'].read_text()
+        if sources['template']:
+            result.template = sources['template'].decode('utf-8')
 
         # Parse styles
-        for style_file in component_files['styles']:
-            result['styles'].append(style_file.read_text())
+        for style_source in sources['styles']:
+            result.styles.append(style_source.decode('utf-8'))
 
         return result
 
@@ -36,9 +131,9 @@ class AngularParser:
         result = {'metadata': {}, 'class_name': '', 'properties': [], 'methods': []}
 
         # Extract component metadata
-        metadata_match = self.component_metadata_pattern.search(content)
-        if metadata_match:
-            metadata_str = metadata_match.group(1)
+        # Brace-balanced, so nested objects such as host: {...} no longer hide the metadata
+        metadata_str = _find_component_metadata(content)
+        if metadata_str:
             result['metadata'] = self._parse_metadata(metadata_str)
 
         # Extract class name
@@ -58,11 +153,11 @@ class AngularParser:
         """
         metadata = {}
         # Basic parsing of selector, templateUrl, and styleUrls
-        selector_match = re.search(r'selector\s*:\s*[\'"]([^\'"]+)[\'"]', metadata_str)
+        selector_match = self.selector_pattern.search(metadata_str)
         if selector_match:
             metadata['selector'] = selector_match.group(1)
 
-        template_match = re.search(r'templateUrl\s*:\s*[\'"]([^\'"]+)[\'"]', metadata_str)
+        template_match = self.template_url_pattern.search(metadata_str)
         if template_match:
             metadata['templateUrl'] = template_match.group(1)
 
@@ -73,13 +168,11 @@ class AngularParser:
         Extracts component properties
         """
         # Basic property extraction (can be enhanced)
-        property_pattern = re.compile(r'@Input\(\)\s+(\w+)')
-        return property_pattern.findall(content)
+        return self.property_pattern.findall(content)
 
     def _extract_methods(self, content: str) -> list:
         """
         Extracts component methods
         """
         # Basic method extraction (can be enhanced)
-        method_pattern = re.compile(r'(\w+)\s*\([^)]*\)\s*{')
-        return method_pattern.findall(content)
+        return self.method_pattern.findall(content)
@@ -1,8 +1,7 @@
 from typing import Dict, Any, List
 from dataclasses import dataclass
 from datetime import datetime
-from ..extractor.component_extractor import UIPattern
-import re
+from ..extractor.component_extractor import UIPattern, count_directives
 
 
 @dataclass
@@ -52,7 +51,7 @@ class PatternProfiler:
             )
 
             # Update optimization suggestions
-            self._update_optimization_suggestions(pattern_id, patterns)
+            self._update_optimization_suggestions(pattern_id, patterns, complexity_score)
 
         return self.profiles
 
@@ -81,22 +80,29 @@ class PatternProfiler:
         if not patterns:
             return 0.0
 
-        total_complexity = 0.0
-        for pattern in patterns:
-            # Calculate based on template structure
-            nesting_depth = pattern.template_structure.count('<')
-            directive_count = len(re.findall(r'\*ng[A-Za-z]+', pattern.template_structure))
-            style_complexity = sum(len(rules.split(';')) for rules in pattern.associated_styles.values())
+        # Scores come back one per pattern in input order, so the total adds the same floats as the per-pattern loop did
+        return sum(self._score_patterns(patterns)) / len(patterns)
 
-            pattern_complexity = (nesting_depth * 0.4 + directive_count * 0.3 + style_complexity * 0.3) / 10
-            total_complexity += pattern_complexity
+    def _score_patterns(self, patterns: List[UIPattern]) -> List[float]:
+        """Scores each pattern from its nesting depth, directive count and style complexity"""
+        # Groups are mostly repeats of a few variations, so each distinct one is scanned once
+        keys = [(pattern.template_structure, tuple(pattern.associated_styles.values())) for pattern in patterns]
+        scores = {}
+        for template, style_rules in keys:
+            if (template, style_rules) not in scores:
+                nesting_depth = template.count('<')
+                directive_count = count_directives(template)
+                style_complexity = sum(rules.count(';') + 1 for rules in style_rules)
 
-        return total_complexity / len(patterns)
+                scores[template, style_rules] = (
+                    nesting_depth * 0.4 + directive_count * 0.3 + style_complexity * 0.3
+                ) / 10
 
-    def _update_optimization_suggestions(self, pattern_id: str, patterns: List[UIPattern]):
-        """Updates optimization suggestions for a pattern"""
+        return list(map(scores.__getitem__, keys))
+
+    def _update_optimization_suggestions(self, pattern_id: str, patterns: List[UIPattern], complexity: float):
+        """Updates optimization suggestions for a pattern from its already computed complexity"""
         suggestions = []
-        complexity = self._calculate_complexity(patterns)
 
         if complexity > 0.7:
             suggestions.append(
@@ -1,9 +1,78 @@
+import bisect
+import hashlib
+import os
 import shutil
 from pathlib import Path
 import json
 import jinja2
 from typing import Dict, Any, List
+from functools import lru_cache
 import re
+from ..core.extractor.component_extractor import count_directives
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Compiled once at import for the complexity breakdown counters
+BINDING_PATTERN = re.compile(r'\{\{[^}]+\}\}')
+EVENT_BINDING_PATTERN = re.compile(r'\([^)]+\)=')
+
+# Digests of the pattern pages last written to an output directory, so unchanged pages are not rewritten
+PAGE_HASHES_FILE = '.catalog-hashes.json'
+
+# Complexity gap beyond which two patterns can never be related (the exact bound is 4/7)
+RELATIONSHIP_COMPLEXITY_WINDOW = 0.6
+
+
+def _to_json(value: Any, indent: int = None) -> str:
+    """Serializes template data to JSON, through orjson when it is installed"""
+    # orjson only supports two-space indentation, which is the only indent the templates ask for
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(value, default=str, option=option).decode()
+    return json.dumps(value, ensure_ascii=False, default=str, indent=indent)
+
+
+@lru_cache(maxsize=4096)
+def _template_complexity(template: str) -> int:
+    """Template complexity percentage, computed once per distinct template structure"""
+    # Basic complexity calculation based on nesting and directives
+    nesting_depth = template.count('<')
+    directives = count_directives(template)
+    return min(100, (nesting_depth * 5 + directives * 10))
+
+
+@lru_cache(maxsize=4096)
+def _style_complexity(style_rules: tuple) -> int:
+    """Style complexity percentage, computed once per distinct set of style rules"""
+    if not style_rules:
+        return 0
+    # Calculate based on number of rules and selectors
+    rules_count = sum(rules.count(';') + 1 for rules in style_rules)
+    return min(100, rules_count * 5)
+
+
+@lru_cache(maxsize=4096)
+def _logic_complexity(template: str) -> int:
+    """Logic complexity percentage, computed once per distinct template structure"""
+    # Calculate based on bindings and expressions
+    # Neither pattern can match without its literal, so templates lacking it skip the regex
+    bindings = len(BINDING_PATTERN.findall(template)) if '{{' in template else 0
+    events = len(EVENT_BINDING_PATTERN.findall(template)) if ')=' in template else 0
+    return min(100, (bindings * 10 + events * 15))
+
+
+def _write_page(path: str, data: bytes):
+    """Writes an encoded page through a raw descriptor, skipping the buffered text-file wrapper"""
+    view = memoryview(data)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
 
 
 class CatalogGenerator:
@@ -23,12 +92,18 @@ class CatalogGenerator:
 
         # Create a proper Jinja2 filter that handles arguments
         def json_filter(value, **kwargs):
-            return json.dumps(value, ensure_ascii=False, default=str, indent=kwargs.get('indent', None))
+            return _to_json(value, indent=kwargs.get('indent', None))
 
         # Register the filter
         self.template_env.filters['tojson'] = json_filter
 
+        # Look the page templates up once instead of on every render
+        self._index_template = self.template_env.get_template('patterns/index.html')
+        self._pattern_template = self.template_env.get_template('patterns/pattern.html')
+        self._relationships_template = self.template_env.get_template('patterns/relationships.html')
+
         self.patterns = {}  # Add this line to store patterns
+        self.pattern_slugs = {}  # Page file name of each pattern, shared by the index links and the page writer
 
     def _setup_output_directory(self):
         """Creates necessary directories and copies assets"""
@@ -39,21 +114,7 @@ class CatalogGenerator:
             patterns_dir.mkdir(parents=True, exist_ok=True)
             assets_dir.mkdir(parents=True, exist_ok=True)
 
-            # Try to copy D3.js from CDN, fallback to local or CDN link if failed
-            d3_dest = assets_dir / 'd3.min.js'
-            if not d3_dest.exists():
-                try:
-                    import urllib.request
-
-                    d3_url = "https://d3js.org/d3.v7.min.js"
-                    urllib.request.urlretrieve(d3_url, d3_dest)
-                    print(f"✓ Downloaded d3.min.js to {d3_dest}")
-                except Exception as e:
-                    print(f"Warning: Could not download D3.js: {str(e)}")
-                    print("Using CDN link instead")
-                    # We'll update the template to use CDN link directly
-
-            # Copy other assets
+            # Copy static assets; the relationship graph loads D3.js from its CDN <script> tag
             template_assets = Path(__file__).parent / 'templates' / 'assets'
             if template_assets.exists():
                 for asset in ['styles.css', 'main.js']:
@@ -69,36 +130,11 @@ class CatalogGenerator:
             print(f"Error setting up directories: {str(e)}")
             raise
 
-    def _print_directory_structure(self, directory: Path, level: int = 0):
-        """Helper method to print directory structure"""
-        indent = "  " * level
-        print(f"{indent}{directory.name}/")
-        for item in directory.iterdir():
-            if item.is_dir():
-                self._print_directory_structure(item, level + 1)
-            else:
-                print(f"{indent}  {item.name}")
-
-    def _generate_index(self, analysis_results: Dict[str, Any]):
-        """Generates the main index.html page"""
-        template = self.template_env.get_template('patterns/index.html')
-
-        # Prepare data for the template - ensure patterns is a dict
-        template_data = {
-            'summary': analysis_results['summary'],
-            'patterns': analysis_results['patterns'],  # This is already a dict from PatternAnalyzer
-            'relationships': analysis_results.get('relationships', {}),
-            'recommendations': analysis_results.get('recommendations', []),
-        }
-
-        # Generate index.html
-        index_content = template.render(**template_data)
-        (self.output_dir / 'patterns').mkdir(parents=True, exist_ok=True)
-        (self.output_dir / 'patterns' / 'index.html').write_text(index_content)
-
     def _generate_pattern_pages(self, patterns: Dict[str, Any]):
         """Generates individual pattern pages"""
-        template = self.template_env.get_template('patterns/pattern.html')
+        template = self._pattern_template
+        patterns_dir = os.path.join(self.output_dir, 'patterns')
+        page_hashes = self._load_page_hashes()
 
         for pattern_name, pattern_data in patterns.items():
             try:
@@ -133,38 +169,52 @@ class CatalogGenerator:
                 }
 
                 # Generate pattern page
-                pattern_content = template.render(**template_data)
-                pattern_file = self.output_dir / 'patterns' / f"{pattern_name.lower().replace(' ', '-')}.html"
-                pattern_file.write_text(pattern_content)
+                pattern_content = template.render(**template_data).encode('utf-8')
+                slug = self.pattern_slugs[pattern_name]
+                pattern_file = os.path.join(patterns_dir, f"{slug}.html")
+
+                # Skip the write when the page on disk already has exactly this content
+                digest = hashlib.blake2b(pattern_content, digest_size=16).hexdigest()
+                if page_hashes.get(slug) == digest and os.path.exists(pattern_file):
+                    continue
+                _write_page(pattern_file, pattern_content)
+                page_hashes[slug] = digest
 
             except Exception as e:
                 print(f"Error generating page for pattern {pattern_name}: {str(e)}")
                 continue
 
+        self._save_page_hashes(page_hashes)
+
+    def _load_page_hashes(self) -> Dict[str, str]:
+        """Reads the digests of the pattern pages written by the previous run"""
+        hashes_file = self.output_dir / PAGE_HASHES_FILE
+        try:
+            return json.loads(hashes_file.read_text())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error reading {hashes_file}, rewriting every pattern page: {str(e)}")
+            return {}
+
+    def _save_page_hashes(self, page_hashes: Dict[str, str]):
+        """Stores the pattern page digests for the next run"""
+        try:
+            (self.output_dir / PAGE_HASHES_FILE).write_text(json.dumps(page_hashes))
+        except Exception as e:
+            print(f"Error saving pattern page digests: {str(e)}")
+
     def _calculate_template_complexity(self, pattern_data: Dict[str, Any]) -> int:
         """Calculate template complexity percentage"""
-        template = pattern_data.get('template_structure', '')
-        # Basic complexity calculation based on nesting and directives
-        nesting_depth = template.count('<')
-        directives = len(re.findall(r'\*ng[A-Za-z]+', template))
-        return min(100, (nesting_depth * 5 + directives * 10))
+        return _template_complexity(pattern_data.get('template_structure', ''))
 
     def _calculate_style_complexity(self, pattern_data: Dict[str, Any]) -> int:
         """Calculate style complexity percentage"""
-        styles = pattern_data.get('associated_styles', {})
-        if not styles:
-            return 0
-        # Calculate based on number of rules and selectors
-        rules_count = sum(len(rules.split(';')) for rules in styles.values())
-        return min(100, rules_count * 5)
+        return _style_complexity(tuple(pattern_data.get('associated_styles', {}).values()))
 
     def _calculate_logic_complexity(self, pattern_data: Dict[str, Any]) -> int:
         """Calculate logic complexity percentage"""
-        template = pattern_data.get('template_structure', '')
-        # Calculate based on bindings and expressions
-        bindings = len(re.findall(r'\{\{[^}]+\}\}', template))
-        events = len(re.findall(r'\([^)]+\)=', template))
-        return min(100, (bindings * 10 + events * 15))
+        return _logic_complexity(pattern_data.get('template_structure', ''))
 
     def _generate_optimization_suggestions(self, pattern_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate optimization suggestions for the pattern"""
@@ -235,7 +285,7 @@ class CatalogGenerator:
 
     def _generate_relationship_graph(self, relationships: Dict[str, List[Dict[str, Any]]]):
         """Generates the relationship visualization page with enhanced metadata"""
-        template = self.template_env.get_template('patterns/relationships.html')
+        template = self._relationships_template
 
         # Convert relationships data to D3.js format
         graph_data = {'nodes': [], 'links': []}
@@ -273,9 +323,15 @@ class CatalogGenerator:
 
                 graph_data['links'].append({'source': source, 'target': target_name, 'value': target['similarity']})
 
-        # Generate relationships.html with the graph data
-        relationship_content = template.render(graph_data=graph_data)
-        (self.output_dir / 'patterns' / 'relationships.html').write_text(relationship_content)
+        # The graph data goes to a script file of its own, so it is serialized once and never copied into the page
+        patterns_dir = os.path.join(self.output_dir, 'patterns')
+        _write_page(
+            os.path.join(patterns_dir, 'relationships-data.js'),
+            f"const relationshipGraphData = {_to_json(graph_data)};\n".encode('utf-8'),
+        )
+
+        # Generate relationships.html, which loads the graph data with a <script> tag
+        _write_page(os.path.join(patterns_dir, 'relationships.html'), template.render().encode('utf-8'))
 
     def _verify_assets(self):
         """Verifies that all required assets are in place"""
@@ -283,15 +339,18 @@ class CatalogGenerator:
 
         print("\nVerifying assets:")
         for file_path in required_files.keys():
-            full_path = self.output_dir / file_path
-            exists = full_path.exists()
+            # One stat both checks the file exists and gives its size, without reading it
+            try:
+                size = os.stat(os.path.join(self.output_dir, file_path)).st_size
+                exists = True
+            except OSError:
+                exists = False
             required_files[file_path] = exists
             print(f"{'✓' if exists else '✗'} {file_path}: {'Found' if exists else 'Missing'}")
             if exists:
                 # Check if file has content
-                content = full_path.read_text()
-                print(f"  Size: {len(content)} bytes")
-                if len(content) == 0:
+                print(f"  Size: {size} bytes")
+                if size == 0:
                     print("  Warning: File is empty!")
 
         return all(required_files.values())
@@ -301,6 +360,7 @@ class CatalogGenerator:
         try:
             # Store patterns data
             self.patterns = analysis_results.get('patterns', {})
+            self.pattern_slugs = {name: name.lower().replace(' ', '-') for name in self.patterns}
 
             # Setup directories and copy assets
             self._setup_output_directory()
@@ -328,7 +388,7 @@ class CatalogGenerator:
     def _generate_index(self, analysis_results: Dict[str, Any]):
         """Generates the main index.html page"""
         try:
-            template = self.template_env.get_template('patterns/index.html')
+            template = self._index_template
 
             # Prepare data for the template
             template_data = {
@@ -337,64 +397,45 @@ class CatalogGenerator:
                 ),
                 'patterns': analysis_results.get('patterns', {}),
                 'relationships': analysis_results.get('relationships', {}),
+                'pattern_slugs': self.pattern_slugs,
             }
 
             # Generate index.html
             index_content = template.render(**template_data)
             index_file = self.output_dir / 'patterns' / 'index.html'
-            index_file.write_text(index_content)
+            _write_page(str(index_file), index_content.encode('utf-8'))
             print(f"Generated index file at {index_file}")
         except Exception as e:
             print(f"Error generating index: {str(e)}")
             raise
 
-    def _generate_pattern_page(self, pattern_name: str, pattern_data: Dict[str, Any]):
-        """Generates a single pattern page"""
-        try:
-            template = self.template_env.get_template('patterns/pattern.html')
-
-            # Prepare the template data
-            template_data = {
-                'name': pattern_name,
-                'usage': pattern_data.get('total_usage', 0),
-                'coverage': pattern_data.get('component_coverage', 0),
-                'complexity': pattern_data.get('complexity', 0.0),
-                'accessibility_score': pattern_data.get('accessibility_score', 0.0),
-                'maintainability_index': pattern_data.get('maintainability_index', 0.0),
-                'best_practices_score': pattern_data.get('best_practices_score', 0.0),
-                'template_structure': pattern_data.get('template_structure', ''),
-                'html_structure': pattern_data.get('html_structure', ''),
-                'styles': pattern_data.get('associated_styles', {}),
-                'variations': pattern_data.get('variations', []),
-                'common_contexts': pattern_data.get('common_contexts', []),
-                'complexity_breakdown': pattern_data.get(
-                    'complexity_breakdown', {'template': 0, 'styles': 0, 'logic': 0}
-                ),
-            }
-
-            # Generate the pattern page
-            pattern_content = template.render(**template_data)
-            pattern_file = self.output_dir / 'patterns' / f"{pattern_name.lower().replace(' ', '-')}.html"
-            pattern_file.write_text(pattern_content)
-            print(f"Generated pattern page: {pattern_file}")
-
-        except Exception as e:
-            print(f"Error generating page for pattern {pattern_name}: {str(e)}")
-
     def _generate_relationship_data(self) -> Dict[str, List[Dict[str, Any]]]:
         """Generate relationships between patterns with enhanced metadata"""
         relationships = {}
 
-        for pattern_name, pattern_data in self.patterns.items():
+        # Add validation and defaults
+        names = list(self.patterns)
+        complexities = [max(0.0, min(1.0, data.get('complexity', 0))) for data in self.patterns.values()]  # 0-1 range
+        usages = [max(1, data.get('total_usage', 1)) for data in self.patterns.values()]  # Minimum usage of 1
+        types = [data.get('pattern_type', 'unknown') for data in self.patterns.values()]
+
+        # Usage similarity adds at most 0.3, so a pair can only clear 0.6 when its complexities are closer than
+        # 4/7; a sweep over the sorted complexities skips every pair outside that window (rounded up for safety)
+        order = sorted(range(len(names)), key=complexities.__getitem__)
+        sorted_complexities = [complexities[i] for i in order]
+
+        for i, pattern_name in enumerate(names):
             relationships[pattern_name] = []
-            # Add validation and defaults
-            pattern_complexity = max(0.0, min(1.0, pattern_data.get('complexity', 0)))  # Ensure 0-1 range
-            pattern_usage = max(1, pattern_data.get('total_usage', 1))  # Ensure minimum usage of 1
+            pattern_complexity = complexities[i]
+            pattern_usage = usages[i]
 
-            for other_name, other_data in self.patterns.items():
-                if pattern_name != other_name:
-                    other_complexity = max(0.0, min(1.0, other_data.get('complexity', 0)))
-                    other_usage = max(1, other_data.get('total_usage', 1))
+            low = bisect.bisect_left(sorted_complexities, pattern_complexity - RELATIONSHIP_COMPLEXITY_WINDOW)
+            high = bisect.bisect_right(sorted_complexities, pattern_complexity + RELATIONSHIP_COMPLEXITY_WINDOW)
+            # Candidates are visited in pattern order so each list keeps its original order
+            for j in sorted(order[low:high]):
+                if j != i:
+                    other_complexity = complexities[j]
+                    other_usage = usages[j]
 
                     # Enhanced similarity calculation
                     complexity_similarity = 1 - abs(pattern_complexity - other_complexity)
@@ -404,11 +445,11 @@ class CatalogGenerator:
                     if similarity > 0.6:  # Slightly lower threshold for more connections
                         relationships[pattern_name].append(
                             {
-                                'name': other_name,
+                                'name': names[j],
                                 'complexity': other_complexity,
                                 'usage': other_usage,
                                 'similarity': similarity,
-                                'type': other_data.get('pattern_type', 'unknown'),
+                                'type': types[j],
                             }
                         )
 
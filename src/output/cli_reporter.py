@@ -41,18 +41,24 @@ class CLIReporter:
         self.console.print(table)
 
     def _print_pattern_details(self, patterns: Dict[str, Any]):
-        self.console.print("\n[bold]Pattern Details[/bold]")
+        # One row per pattern in a single table prints far less terminal output than a bordered panel each
+        table = Table(title="Pattern Details")
+        table.add_column("Pattern", style="cyan")
+        table.add_column("Usage", justify="right")
+        table.add_column("Component Coverage", justify="right")
+        table.add_column("Complexity Score", justify="right")
+        table.add_column("Variations", justify="right")
 
         for name, details in patterns.items():
-            panel = Panel.fit(
-                f"Usage: {details['total_usage']}\n"
-                f"Component Coverage: {details['component_coverage']}\n"
-                f"Complexity Score: {details['complexity_score']:.2f}\n"
-                f"Variations: {len(details['variations'])}",
-                title=name,
-                border_style="cyan",
+            table.add_row(
+                name,
+                str(details['total_usage']),
+                str(details['component_coverage']),
+                f"{details['complexity_score']:.2f}",
+                str(len(details['variations'])),
             )
-            self.console.print(panel)
+
+        self.console.print(table)
 
     def _print_recommendations(self, recommendations: List[Dict[str, Any]]):
         if not recommendations:
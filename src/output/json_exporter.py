@@ -3,16 +3,50 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Nesting levels written entry by entry; anything deeper is encoded in one shot by the C encoder
+STREAMED_JSON_DEPTH = 3
+
+
+def _write_compact_json(f, value: Any, depth: int = STREAMED_JSON_DEPTH):
+    """Writes value as compact JSON, with the same output as json.dumps but without one string for the whole tree"""
+    # Non-string keys are coerced by the encoder itself, so such dicts are left to it
+    if depth <= 0 or not isinstance(value, dict) or not all(isinstance(key, str) for key in value):
+        f.write(json.dumps(value, separators=(',', ':')))
+        return
+
+    f.write('{')
+    for index, (key, item) in enumerate(value.items()):
+        f.write(f"{',' if index else ''}{json.dumps(key)}:")
+        _write_compact_json(f, item, depth - 1)
+    f.write('}')
+
 
 class JSONExporter:
     def __init__(self, export_path: Path):
         self.export_path = export_path
 
-    def export_report(self, analysis_results: Dict[str, Any]):
+    def export_report(self, analysis_results: Dict[str, Any], pretty: bool = False):
         """
-        Exports analysis results to a JSON file
+        Exports analysis results to a JSON file, indented only when pretty is set
         """
-        export_data = {'timestamp': datetime.now().isoformat(), 'analysis_results': analysis_results}
+        timestamp = datetime.now().isoformat()
+
+        # orjson serializes straight to bytes, skipping the str encoding pass of the stdlib encoder
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            with self.export_path.open('wb') as f:
+                f.write(orjson.dumps({'timestamp': timestamp, 'analysis_results': analysis_results}, option=option))
+            return
 
         with self.export_path.open('w') as f:
-            json.dump(export_data, f, indent=2)
+            if pretty:
+                json.dump({'timestamp': timestamp, 'analysis_results': analysis_results}, f, indent=2)
+            else:
+                # Each pattern is encoded in one shot by the C encoder (dump() and iterencode() always run in
+                # Python), while the report is streamed pattern by pattern instead of built as one string
+                _write_compact_json(f, {'timestamp': timestamp, 'analysis_results': analysis_results})
@@ -2,11 +2,13 @@ from typing import Dict, Any
 from .cli_reporter import CLIReporter
 from .json_exporter import JSONExporter
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 
 class ReportGenerator:
-    def __init__(self, output_format: str = 'both', export_path: Path = None):
+    def __init__(self, output_format: str = 'both', export_path: Path = None, pretty_json: bool = False):
         self.output_format = output_format
+        self.pretty_json = pretty_json
         self.cli_reporter = CLIReporter()
         self.json_exporter = JSONExporter(export_path or Path('./pattern-report.json'))
 
@@ -14,8 +16,19 @@ class ReportGenerator:
         """
         Generates reports based on the specified output format
         """
-        if self.output_format in ['cli', 'both']:
+        if self.output_format == 'both':
+            # The terminal report and the JSON file are independent, so their writes overlap
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                cli_report = executor.submit(self.cli_reporter.generate_report, analysis_results)
+                json_report = executor.submit(
+                    self.json_exporter.export_report, analysis_results, pretty=self.pretty_json
+                )
+            cli_report.result()
+            json_report.result()
+            return
+
+        if self.output_format == 'cli':
             self.cli_reporter.generate_report(analysis_results)
 
-        if self.output_format in ['json', 'both']:
-            self.json_exporter.export_report(analysis_results)
+        if self.output_format == 'json':
+            self.json_exporter.export_report(analysis_results, pretty=self.pretty_json)
@@ -0,0 +1,71 @@
+import unittest
+
+from src.core.parser.angular_parser import AngularParser, _find_component_metadata
+
+
+class FindComponentMetadataTest(unittest.TestCase):
+    def test_nested_host_object(self):
+        content = """
+@Component({
+  selector: 'app-menu',
+  host: { class: 'menu', '(click)': 'toggle()' },
+  templateUrl: './menu.component.html'
+})
+export class MenuComponent {}
+"""
+        metadata = _find_component_metadata(content)
+        self.assertTrue(metadata.rstrip().endswith("templateUrl: './menu.component.html'"))
+        self.assertIn("host: { class: 'menu', '(click)': 'toggle()' }", metadata)
+
+    def test_braces_inside_strings(self):
+        content = """@Component({
+  selector: "app-{odd}",
+  template: '<span>{{ count }}</span>}',
+  styles: [':host { display: block; }']
+}) export class CounterComponent {}"""
+        metadata = _find_component_metadata(content)
+        self.assertTrue(metadata.rstrip().endswith("styles: [':host { display: block; }']"))
+
+    def test_braces_inside_backtick_template(self):
+        content = """@Component({
+  selector: 'app-list',
+  template: `
+    <li *ngFor="let item of items">{{ item.name }}</li>
+    ${'}'}
+  `,
+  standalone: true
+})
+export class ListComponent { items = []; }"""
+        metadata = _find_component_metadata(content)
+        self.assertTrue(metadata.rstrip().endswith('standalone: true'))
+
+    def test_comment_containing_an_apostrophe(self):
+        content = """@Component({
+  selector: 'app-users', // the user's list
+  host: { class: 'users' },
+  /* don't add { here */
+  templateUrl: './users.component.html'
+})
+export class UsersComponent { load() { return 1; } }"""
+        metadata = _find_component_metadata(content)
+        self.assertIsNotNone(metadata)
+        self.assertTrue(metadata.rstrip().endswith("templateUrl: './users.component.html'"))
+
+    def test_missing_or_unclosed_decorator(self):
+        self.assertIsNone(_find_component_metadata('export class Plain {}'))
+        self.assertIsNone(_find_component_metadata("@Component({ selector: 'app-x' "))
+
+    def test_metadata_is_parsed_from_the_balanced_body(self):
+        content = """@Component({
+  host: { role: 'button' }, // it's nested
+  selector: 'app-button',
+  templateUrl: './button.component.html'
+})
+export class ButtonComponent {}"""
+        info = AngularParser().parse_component_sources({'typescript': content.encode(), 'template': None, 'styles': []})
+        self.assertEqual(info.metadata, {'selector': 'app-button', 'templateUrl': './button.component.html'})
+        self.assertEqual(info.class_name, 'ButtonComponent')
+
+
+if __name__ == '__main__':
+    unittest.main()
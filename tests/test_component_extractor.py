@@ -0,0 +1,144 @@
+import random
+import re
+import unittest
+from unittest import mock
+
+from src.core.extractor import component_extractor
+from src.core.extractor.component_extractor import ComponentExtractor, UIPattern, _parse_stylesheet
+
+
+def _pattern(name: str, structure: str, components: tuple) -> UIPattern:
+    return UIPattern(name=name, frequency=1, variations=(), components=components, template_structure=structure)
+
+
+def _pairwise_relationships(patterns):
+    """The original O(n^2) loop analyze_pattern_relationships must keep matching"""
+    relationships = {}
+    for pattern in patterns:
+        related_patterns = []
+        for other in patterns:
+            if pattern != other and (
+                set(pattern.components) & set(other.components)
+                or pattern.template_structure in other.template_structure
+                or other.template_structure in pattern.template_structure
+            ):
+                related_patterns.append(other.name)
+        if related_patterns:
+            relationships[pattern.name] = related_patterns
+    return relationships
+
+
+def _regex_associated_styles(selector_path, styles):
+    """The original per-selector findall that the stylesheet map replaced"""
+    associated_styles = {}
+    for style in styles:
+        for selector in selector_path.split():
+            for rules in re.findall(rf'{selector}\s*\{{([^}}]+)\}}', style):
+                associated_styles[selector] = rules.strip()
+    return associated_styles
+
+
+class AnalyzePatternRelationshipsTest(unittest.TestCase):
+    def setUp(self):
+        self.extractor = ComponentExtractor()
+
+    def _assert_matches_pairwise(self, patterns):
+        expected = _pairwise_relationships(patterns)
+        self.assertEqual(self.extractor.analyze_pattern_relationships(patterns), expected)
+        # The substring fallback must agree with the automaton
+        with mock.patch.object(component_extractor, 'ahocorasick', None):
+            self.assertEqual(self.extractor.analyze_pattern_relationships(patterns), expected)
+
+    def test_shared_components_and_contained_structures(self):
+        patterns = [
+            _pattern('list', '<ul><li></li></ul>', ('UserList',)),
+            _pattern('item', '<li></li>', ('Other',)),
+            _pattern('button', '<button></button>', ('UserList',)),
+            _pattern('lonely', '<form></form>', ('Settings',)),
+        ]
+        self.assertEqual(
+            self.extractor.analyze_pattern_relationships(patterns),
+            {'list': ['item', 'button'], 'item': ['list'], 'button': ['list']},
+        )
+        self._assert_matches_pairwise(patterns)
+
+    def test_equal_patterns_are_not_related_to_each_other(self):
+        patterns = [
+            _pattern('card', '<div></div>', ('A',)),
+            _pattern('card', '<div></div>', ('B',)),
+            _pattern('wrapper', '<section><div></div></section>', ('C',)),
+        ]
+        self._assert_matches_pairwise(patterns)
+
+    def test_empty_structure_is_contained_in_every_structure(self):
+        patterns = [
+            _pattern('empty', '', ('A',)),
+            _pattern('span', '<span></span>', ('B',)),
+            _pattern('other-empty', '', ('C',)),
+        ]
+        self._assert_matches_pairwise(patterns)
+
+    def test_randomized_against_pairwise_loop(self):
+        rng = random.Random(0)
+        fragments = ['<div>', '</div>', '<li>', '</li>', 'x', '']
+        for _ in range(200):
+            patterns = [
+                _pattern(
+                    rng.choice('abcde'),
+                    ''.join(rng.choice(fragments) for _ in range(rng.randint(0, 4))),
+                    tuple(rng.sample('PQRST', rng.randint(0, 2))),
+                )
+                for _ in range(rng.randint(0, 8))
+            ]
+            self._assert_matches_pairwise(patterns)
+
+
+class ExtractAssociatedStylesTest(unittest.TestCase):
+    def setUp(self):
+        self.extractor = ComponentExtractor()
+
+    def test_last_rule_wins(self):
+        style = '.card { color: red; }\n.card { color: blue; margin: 0; }'
+        self.assertEqual(
+            self.extractor._extract_associated_styles('.card', [style]), {'.card': 'color: blue; margin: 0;'}
+        )
+        # Across stylesheets the later one wins too
+        styles = ['.card { color: red; }', '.card { color: green; }']
+        self.assertEqual(self.extractor._extract_associated_styles('.card', styles), {'.card': 'color: green;'})
+
+    def test_descendant_selector_is_found_under_its_last_compound(self):
+        style = '.card .title { font-weight: bold; }\n.card { padding: 4px; }'
+        self.assertEqual(
+            _parse_stylesheet(style),
+            {'.card .title': 'font-weight: bold;', '.title': 'font-weight: bold;', '.card': 'padding: 4px;'},
+        )
+        self.assertEqual(
+            self.extractor._extract_associated_styles('.card .title', [style]),
+            {'.card': 'padding: 4px;', '.title': 'font-weight: bold;'},
+        )
+
+    def test_compound_selector_and_missing_rules(self):
+        style = '.btn.primary { background: blue; }\n.btn {}\n.other { color: red; }'
+        self.assertEqual(
+            self.extractor._extract_associated_styles('.btn.primary .btn .missing', [style]),
+            {'.btn.primary': 'background: blue;'},
+        )
+
+    def test_matches_the_regex_it_replaced(self):
+        styles = [
+            '.card { color: red; }\n.card .title { font-size: 2em; }\n.card { color: blue; }',
+            '.list .item.active { color: green; }\n.item.active{margin:0}\n.empty {}',
+            '@media (max-width: 600px) { .card { display: none; } }\n.title { text-transform: none; }',
+        ]
+        selector_paths = ['.card', '.title', '.card .title', '.item.active', '.list .item.active .empty', '.none']
+        for style in styles:
+            for selector_path in selector_paths:
+                with self.subTest(style=style, selector_path=selector_path):
+                    self.assertEqual(
+                        self.extractor._extract_associated_styles(selector_path, [style]),
+                        _regex_associated_styles(selector_path, [style]),
+                    )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.output import json_exporter
+from src.output.json_exporter import JSONExporter, _write_compact_json
+
+SAMPLE_VALUES = [
+    {},
+    [],
+    'plain',
+    None,
+    {'a': 1, 'b': [1, 2.5, None, True, False], 'c': {'d': {'e': {'f': {'g': 'deep'}}}}},
+    {'unicode': 'caf\u00e9 \u2713 \u2028', 'quote': 'say "hi"\n\ttab', 'emoji': '\U0001f600'},
+    {'floats': [0.1, 1e300, -0.0, float('nan'), float('inf'), float('-inf')]},
+    {'patterns': {'data-list': {'total_usage': 3, 'variations': [{'similarity_score': 0.75}]}}},
+    {1: 'int key', 'two': {2.5: 'float key', None: 'none key', True: 'bool key'}},
+    {'nested': [{'in': {'a': {'list': {}}}}], 'empty': {'': ''}},
+]
+
+
+def _compact(value) -> str:
+    output = io.StringIO()
+    _write_compact_json(output, value)
+    return output.getvalue()
+
+
+class WriteCompactJsonTest(unittest.TestCase):
+    def test_matches_json_dumps(self):
+        for value in SAMPLE_VALUES:
+            with self.subTest(value=value):
+                self.assertEqual(_compact(value), json.dumps(value, separators=(',', ':')))
+
+    def test_matches_json_dumps_at_every_streamed_depth(self):
+        value = {'a': {'b': {'c': {'d': [1, {'e': 'f'}]}}, 'g': 2}, 'h': {}}
+        for depth in range(6):
+            with self.subTest(depth=depth):
+                output = io.StringIO()
+                _write_compact_json(output, value, depth)
+                self.assertEqual(output.getvalue(), json.dumps(value, separators=(',', ':')))
+
+
+class JSONExporterTest(unittest.TestCase):
+    def _export(self, analysis_results, pretty=False) -> bytes:
+        with tempfile.TemporaryDirectory() as directory:
+            export_path = Path(directory, 'report.json')
+            with mock.patch.object(json_exporter, 'orjson', None):
+                JSONExporter(export_path).export_report(analysis_results, pretty=pretty)
+            return export_path.read_bytes()
+
+    def test_compact_report_is_byte_identical_to_json_dumps(self):
+        analysis_results = SAMPLE_VALUES[7]
+        data = self._export(analysis_results)
+        timestamp = json.loads(data)['timestamp']
+        expected = json.dumps({'timestamp': timestamp, 'analysis_results': analysis_results}, separators=(',', ':'))
+        self.assertEqual(data, expected.encode())
+
+    def test_pretty_report_is_indented(self):
+        analysis_results = SAMPLE_VALUES[7]
+        data = self._export(analysis_results, pretty=True)
+        timestamp = json.loads(data)['timestamp']
+        expected = json.dumps({'timestamp': timestamp, 'analysis_results': analysis_results}, indent=2)
+        self.assertEqual(data, expected.encode())
+
+
+if __name__ == '__main__':
+    unittest.main()
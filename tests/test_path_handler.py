@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.cli.path_handler import PathHandler
+
+COMPONENT_SOURCE = "@Component({ selector: 'app-a', templateUrl: './a.component.html' })\nexport class AComponent {}\n"
+
+
+class ScanProjectTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+
+    def test_symlinked_component_files_are_found(self):
+        shared = self.root / 'shared'
+        shared.mkdir()
+        (shared / 'a.component.ts').write_text(COMPONENT_SOURCE)
+        (shared / 'a.component.html').write_text('<div></div>')
+        (shared / 'a.component.scss').write_text('div { color: red; }')
+
+        component_dir = self.root / 'src' / 'app' / 'a'
+        component_dir.mkdir(parents=True)
+        for name in ['a.component.ts', 'a.component.html', 'a.component.scss']:
+            os.symlink(Path('..', '..', '..', 'shared', name), component_dir / name)
+
+        components = PathHandler().scan_project(self.root / 'src')
+        component_file = component_dir / 'a.component.ts'
+        self.assertEqual(list(components), [component_file])
+        self.assertEqual(components[component_file]['template'], component_dir / 'a.component.html')
+        self.assertEqual(components[component_file]['styles'], [component_dir / 'a.component.scss'])
+
+    def test_symlinked_directories_are_not_walked(self):
+        shared = self.root / 'shared'
+        shared.mkdir()
+        (shared / 'a.component.ts').write_text(COMPONENT_SOURCE)
+
+        source = self.root / 'src'
+        source.mkdir()
+        os.symlink(Path('..', 'shared'), source / 'linked', target_is_directory=True)
+
+        self.assertEqual(PathHandler().scan_project(source), {})
+
+
+if __name__ == '__main__':
+    unittest.main()